@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Request, logging and concurrency helpers shared by the API tester scripts.
+
+Each script subclasses ApiTester with its own test methods; the class attributes
+below cover the few places where the scripts report results differently.
+"""
+
+import copy
+import itertools
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import httpx
+import orjson
+
+# Set per request, and only with a JSON body: a client-level Content-Type would
+# override the multipart boundary and label bodiless GETs and DELETEs
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Constant request body, serialized once instead of on every login
+LOGIN_BODY = orjson.dumps({"email": "admin@dryclean.com", "password": "admin123"})
+
+# Reference data that stays fixed for the run unless the run itself writes to it
+CACHED_GET_ENDPOINTS = ("items", "categories", "item-categories")
+
+
+class ApiTester:
+    # Per-request timeout in seconds
+    TIMEOUT = 10.0
+    # Test name logged for the admin login
+    LOGIN_TEST_NAME = "Login"
+    # Returned for a successful response without a JSON body
+    EMPTY_RESULT = {}
+    # How much of a non-JSON error body goes into the failure details
+    ERROR_TEXT_LIMIT = 100
+
+    # Suffixes for generated names; the pid prefix keeps parallel workers from colliding
+    _uid = itertools.count()
+
+    def __init__(self, base_url="https://fresh-garments-1.preview.emergentagent.com"):
+        self.base_url = base_url
+        self.token = None
+        self.tests_run = 0
+        self.tests_passed = 0
+        # (name, success, details) per logged test
+        self.test_results = []
+        # Independent test groups run on worker threads and share the counters below
+        self._lock = threading.Lock()
+        # One HTTP/2 client shared by every worker thread: concurrent calls become
+        # streams on a single multiplexed connection instead of separate sockets
+        self.client = httpx.Client(
+            base_url=f"{self.base_url}/api/",
+            http2=True,
+            timeout=self.TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=8),
+        )
+        # Long-lived workers for fanned-out requests
+        self._request_pool = ThreadPoolExecutor(max_workers=8)
+        # Parsed GET responses for CACHED_GET_ENDPOINTS, reused instead of refetching
+        self._get_cache = {}
+
+    def set_session_header(self, name, value):
+        """Send a header on every request from now on"""
+        self.client.headers[name] = value
+
+    def close(self):
+        """Release the worker threads and the pooled connection"""
+        self._request_pool.shutdown()
+        self.client.close()
+
+    def unique_suffix(self):
+        """Short suffix that makes a generated name unique within this run"""
+        return f"{os.getpid() % 1000:03d}{next(self._uid):03d}"
+
+    def warmup(self):
+        """Resolve the host and open the pooled connection before the first real test"""
+        try:
+            url = urlparse(self.base_url)
+            socket.getaddrinfo(url.hostname, url.port or (443 if url.scheme == "https" else 80))
+            self.client.head("", timeout=5.0)
+        except (OSError, httpx.HTTPError):
+            # A cold first request is slower, not broken; the tests report real failures
+            pass
+
+    def log_test(self, name, success, details=""):
+        """Log test result"""
+        with self._lock:
+            self.tests_run += 1
+            if success:
+                self.tests_passed += 1
+                print(f"✅ {name}")
+            else:
+                print(f"❌ {name} - {details}")
+
+            self.test_results.append((name, success, details))
+
+    def run_group(self, tests):
+        """Run (name, test) pairs in order, reporting exceptions without stopping the group"""
+        for test_name, test_func in tests:
+            try:
+                test_func()
+            except Exception as e:
+                print(f"❌ {test_name} - Exception: {str(e)}")
+
+    def login(self):
+        """Log in as the admin and send the token on every later request; False if the login fails"""
+        # The token lives only as long as this tester, so every run checks the login route
+        try:
+            response = self.client.post("auth/login", content=LOGIN_BODY, headers=JSON_HEADERS)
+            response.raise_for_status()
+            self.token = orjson.loads(response.content)["access_token"]
+        except Exception as e:
+            self.log_test(self.LOGIN_TEST_NAME, False, f"Exception: {str(e)}")
+            return False
+        self.log_test(self.LOGIN_TEST_NAME, True)
+        self.set_session_header('Authorization', f'Bearer {self.token}')
+        return True
+
+    def invalidate(self, endpoint_prefix):
+        """Drop cached GET responses under a prefix after a write to it"""
+        with self._lock:
+            for endpoint in [e for e in self._get_cache if e.startswith(endpoint_prefix)]:
+                del self._get_cache[endpoint]
+
+    def run_parallel(self, specs, **kwargs):
+        """Issue independent run_test calls at once and return their results in order"""
+        return list(self._request_pool.map(lambda spec: self.run_test(*spec, **kwargs), specs))
+
+    def run_concurrently(self, groups):
+        """Run independent groups of tests on worker threads; the calls are network-bound"""
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            list(executor.map(self.run_group, groups))
+
+    def run_test(self, name, method, endpoint, expected_status, data=None, headers=None, files=None, parse_json=True):
+        """Run a single API test; with parse_json=False a successful response body is never downloaded"""
+        cacheable = method == 'GET' and endpoint in CACHED_GET_ENDPOINTS
+        if cacheable and endpoint in self._get_cache:
+            # Nothing was sent, so nothing is logged as passed; callers get their own copy to mutate
+            return copy.deepcopy(self._get_cache[endpoint])
+
+        if files:
+            request_body = {"data": data, "files": files}
+        elif data is not None:
+            # JSON payloads may already be serialized; anything else goes through orjson rather than stdlib json
+            request_body = {"content": data if isinstance(data, (bytes, bytearray)) else orjson.dumps(data)}
+            headers = {**JSON_HEADERS, **headers} if headers else JSON_HEADERS
+        else:
+            request_body = {}
+
+        try:
+            request = self.client.build_request(method, endpoint, headers=headers, **request_body)
+            response = self.client.send(request, stream=not parse_json)
+
+            if method != 'GET' and endpoint.startswith(("items", "categories")):
+                # item-categories is derived from items, so item writes drop it too
+                self.invalidate("item" if endpoint.startswith("items") else "categories")
+
+            success = response.status_code == expected_status
+            details = f"Status: {response.status_code}"
+
+            if not success:
+                details += f" (Expected {expected_status})"
+                response.read()
+                try:
+                    error_data = orjson.loads(response.content)
+                    details += f" - {error_data.get('detail', 'Unknown error')}"
+                except:
+                    details += f" - {response.text[:self.ERROR_TEXT_LIMIT]}"
+
+            self.log_test(name, success, details)
+
+            if success:
+                if not parse_json:
+                    # Hand the connection back without reading a body nobody uses
+                    response.close()
+                    return dict(self.EMPTY_RESULT)
+                try:
+                    result = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    return dict(self.EMPTY_RESULT)
+                if cacheable:
+                    with self._lock:
+                        self._get_cache[endpoint] = copy.deepcopy(result)
+                return result
+            return None
+
+        except Exception as e:
+            self.log_test(name, False, f"Exception: {str(e)}")
+            return None
@@ -1,21 +1,29 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Query, UploadFile, File, Form
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Query, UploadFile, File, Form, BackgroundTasks
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import StreamingResponse, FileResponse, Response, ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import WaitQueueTimeoutError, ServerSelectionTimeoutError
 import os
+import re
+import asyncio
+import hashlib
 import logging
 import csv
 import io
 import base64
+import copy
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone, timedelta
 import jwt
-import bcrypt
+from passlib.context import CryptContext
+from cachetools import TTLCache
 from enum import Enum
 import qrcode
 from io import BytesIO
@@ -23,18 +31,50 @@ from io import BytesIO
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Motor sizes its executor from MOTOR_MAX_WORKERS at import time, so import it after .env is loaded
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', 50)),
+    minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', 10)),
+    # Fail fast when every pooled connection is busy instead of queueing indefinitely
+    waitQueueTimeoutMS=int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', 5000)),
+    serverSelectionTimeoutMS=int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 2000))
+)
 db = client[os.environ['DB_NAME']]
 
+# Multi-document transactions need a replica set; leave off for a standalone dev server
+MONGO_TRANSACTIONS = os.environ.get('MONGO_TRANSACTIONS', 'false').lower() == 'true'
+
 # JWT Configuration
 JWT_SECRET = os.environ.get('JWT_SECRET_KEY', 'dryclean_pos_secret')
 JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM', 'HS256')
 JWT_EXPIRATION_HOURS = int(os.environ.get('JWT_EXPIRATION_HOURS', 24))
 
+# Password hashing: argon2id for new hashes, existing bcrypt hashes still verify
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the Mongo pool before serving the first request and close it on shutdown"""
+    await client.admin.command("ping")
+    await ensure_indexes()
+    await backfill_item_counters()
+    yield
+    client.close()
+
 # Create the main app
-app = FastAPI(title="DryClean POS API")
+# Serialise every JSON response with orjson
+app = FastAPI(title="DryClean POS API", lifespan=lifespan, default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
 
@@ -105,6 +145,9 @@ class NotificationEvent(str, Enum):
 
 # ======================== MODELS ========================
 
+# Response models are built from stored documents and never mutated afterwards
+RESPONSE_MODEL_CONFIG = ConfigDict(frozen=True, defer_build=True)
+
 # User Models
 class UserBase(BaseModel):
     email: EmailStr
@@ -119,6 +162,8 @@ class UserLogin(BaseModel):
     password: str
 
 class UserResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     email: str
     name: str
@@ -126,6 +171,8 @@ class UserResponse(BaseModel):
     created_at: str
 
 class TokenResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     access_token: str
     token_type: str = "bearer"
     user: UserResponse
@@ -200,6 +247,8 @@ class BusinessSettings(BaseModel):
     open_drawer_on_payment: bool = True
 
 class SettingsResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     settings: BusinessSettings
     updated_at: str
@@ -222,6 +271,8 @@ class CategoryUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 class CategoryResponse(CategoryBase):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     created_at: str
 
@@ -262,6 +313,8 @@ class ItemUpdate(BaseModel):
     pieces: Optional[int] = None
 
 class ItemResponse(ItemBase):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     category_name: Optional[str] = None
     parent_name: Optional[str] = None
@@ -326,6 +379,8 @@ class CustomerUpdate(BaseModel):
     loyalty_excluded: Optional[bool] = None
 
 class CustomerResponse(CustomerBase):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     loyalty_points: int = 0
     total_orders: int = 0
@@ -406,6 +461,8 @@ class OrderStatusUpdate(BaseModel):
     notes: Optional[str] = None
 
 class OrderResponse(OrderBase):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     order_number: str
     status: OrderStatus
@@ -424,6 +481,8 @@ class PaymentCreate(BaseModel):
     origin_url: Optional[str] = None
 
 class PaymentResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     order_id: str
     amount: float
@@ -505,6 +564,8 @@ class InvoicePayment(BaseModel):
     notes: Optional[str] = None
 
 class InvoiceResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     invoice_number: str
     customer_id: str
@@ -528,10 +589,14 @@ class InvoiceResponse(BaseModel):
 # ======================== HELPERS ========================
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    return pwd_context.hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+    return pwd_context.verify(password, hashed)
+
+async def upgrade_password_hash(user_id: str, password: str):
+    """Re-hash a password stored under a deprecated scheme"""
+    await db.users.update_one({"id": user_id}, {"$set": {"password_hash": hash_password(password)}})
 
 def create_token(user_id: str, email: str, role: str) -> str:
     payload = {
@@ -557,17 +622,21 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+def new_id() -> str:
+    """Generate a document id (32-char hex UUID4, no dashes)"""
+    return uuid.uuid4().hex
+
 def generate_order_number() -> str:
     now = datetime.now(timezone.utc)
-    return f"DC{now.strftime('%y%m%d')}{str(uuid.uuid4())[:4].upper()}"
+    return f"DC{now.strftime('%y%m%d')}{new_id()[:4].upper()}"
 
 def generate_invoice_number() -> str:
     now = datetime.now(timezone.utc)
-    return f"INV{now.strftime('%y%m%d')}{str(uuid.uuid4())[:4].upper()}"
+    return f"INV{now.strftime('%y%m%d')}{new_id()[:4].upper()}"
 
 def generate_garment_id(order_number: str, item_index: int, piece_index: int) -> str:
     """Generate unique garment ID for QR codes"""
-    unique_part = str(uuid.uuid4())[:6].upper()
+    unique_part = new_id()[:6].upper()
     return f"G{order_number[2:]}-{item_index:02d}-{piece_index:02d}-{unique_part}"
 
 def generate_qr_code_base64(data: str) -> str:
@@ -622,14 +691,104 @@ def calculate_volume_discount(item_id: str, quantity: int, volume_discounts: Lis
     if not volume_discounts:
         return 0.0
     
+    # Single pass for the highest threshold reached, no per-call sort
     applicable_discount = 0.0
-    for vd in sorted(volume_discounts, key=lambda x: x.min_quantity, reverse=True):
-        if quantity >= vd.min_quantity:
+    best_min_quantity = None
+    for vd in volume_discounts:
+        if quantity >= vd.min_quantity and (best_min_quantity is None or vd.min_quantity > best_min_quantity):
+            best_min_quantity = vd.min_quantity
             applicable_discount = vd.discount_percent
-            break
     
     return applicable_discount
 
+def resolve_loyalty_tiers(tiers: List[dict], points: int):
+    """Return the (current, next) loyalty tier for a points balance in a single pass"""
+    current_tier = None
+    next_tier = None
+    for tier in tiers:
+        min_points = tier.get("min_points", 0)
+        if min_points <= points:
+            if current_tier is None or min_points > current_tier.get("min_points", 0):
+                current_tier = tier
+        elif next_tier is None or min_points < next_tier.get("min_points", 0):
+            next_tier = tier
+    return current_tier, next_tier
+
+def calculate_loyalty_points(amount: float, points_per_dollar: float, tiers: List[dict], current_points: int) -> int:
+    """Points earned for an amount, applying the multiplier of the customer's current tier"""
+    current_tier, _ = resolve_loyalty_tiers(tiers, current_points)
+    multiplier = current_tier.get("multiplier", 1.0) if current_tier else 1.0
+    return int(amount * points_per_dollar * multiplier)
+
+# Names denormalized onto items; categories and parent items change rarely relative to item writes
+_category_name_cache = TTLCache(maxsize=1024, ttl=60)
+_item_name_cache = TTLCache(maxsize=1024, ttl=60)
+
+async def get_category_name(category_id: str) -> Optional[str]:
+    """Get a category name, served from the TTL cache when possible"""
+    if category_id in _category_name_cache:
+        return _category_name_cache[category_id]
+    category = await db.categories.find_one({"id": category_id}, {"_id": 0, "name": 1})
+    name = category["name"] if category else None
+    _category_name_cache[category_id] = name
+    return name
+
+# Reference data responses (categories, items, drivers), cleared on any mutation of that data.
+# Invalidation only reaches this process, so with several workers another worker can serve
+# (and ETag) stale data until its entry expires; the short TTL bounds that window.
+REFERENCE_CACHE_TTL_SECONDS = int(os.environ.get('REFERENCE_CACHE_TTL_SECONDS', 10))
+_reference_cache = TTLCache(maxsize=256, ttl=REFERENCE_CACHE_TTL_SECONDS)
+
+def cached_reference(cache_key):
+    """Copy of a cached reference response, or None; the copy keeps handlers from mutating the cache"""
+    value = _reference_cache.get(cache_key)
+    return None if value is None else copy.deepcopy(value)
+
+def invalidate_reference_cache():
+    _reference_cache.clear()
+
+# Metrics responses, cleared whenever orders, payments or customers change
+_metrics_cache = TTLCache(maxsize=256, ttl=60)
+
+def invalidate_metrics_cache():
+    _metrics_cache.clear()
+
+def metrics_cache_control(response: Response):
+    """Let the browser reuse a metrics response for 30 seconds.
+    
+    Metrics are per-user authenticated responses, so shared caches must not store them.
+    """
+    response.headers["Cache-Control"] = "private, max-age=30"
+
+async def get_item_name(item_id: str) -> Optional[str]:
+    """Get an item name, served from the TTL cache when possible"""
+    if item_id in _item_name_cache:
+        return _item_name_cache[item_id]
+    item = await db.items.find_one({"id": item_id}, {"_id": 0, "name": 1})
+    name = item["name"] if item else None
+    _item_name_cache[item_id] = name
+    return name
+
+async def stream_json_array(first, docs, model):
+    """Stream an already-serialized first document and the rest of docs as a JSON array"""
+    yield b"[" + first
+    async for doc in docs:
+        yield b"," + model.model_validate(doc).model_dump_json().encode()
+    yield b"]"
+
+
+async def json_array_response(cursor, model):
+    """Return a cursor as a streamed JSON array, serializing each document through its response model"""
+    # The first document is fetched and validated before any status is sent, so a
+    # pool or server selection timeout still reaches the 503 handler and a bad row
+    # is a 500, not a 200 with a cut-off body
+    docs = cursor.__aiter__()
+    try:
+        first = model.model_validate(await docs.__anext__()).model_dump_json().encode()
+    except StopAsyncIteration:
+        return ORJSONResponse([])
+    return StreamingResponse(stream_json_array(first, docs, model), media_type="application/json")
+
 
 async def award_loyalty_points(customer_id: str, order_id: str, amount: float, order_number: str):
     """Award loyalty points to customer after successful payment"""
@@ -654,19 +813,11 @@ async def award_loyalty_points(customer_id: str, order_id: str, amount: float, o
     if customer.get("customer_type") == "business" and settings.get("exclude_business_customers", True):
         return
     
-    # Calculate points to award
-    points_per_dollar = settings.get("points_per_dollar", 1.0)
-    
-    # Apply tier multiplier
+    # Calculate points to award with the current tier multiplier
     current_points = customer.get("loyalty_points", 0)
-    multiplier = 1.0
-    tiers = settings.get("tiers", [])
-    for tier in sorted(tiers, key=lambda x: x.get("min_points", 0), reverse=True):
-        if current_points >= tier.get("min_points", 0):
-            multiplier = tier.get("multiplier", 1.0)
-            break
-    
-    points_earned = int(amount * points_per_dollar * multiplier)
+    points_earned = calculate_loyalty_points(
+        amount, settings.get("points_per_dollar", 1.0), settings.get("tiers", []), current_points
+    )
     
     if points_earned <= 0:
         return
@@ -687,7 +838,7 @@ async def award_loyalty_points(customer_id: str, order_id: str, amount: float, o
     # Record transaction
     now = datetime.now(timezone.utc).isoformat()
     transaction = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "customer_id": customer_id,
         "order_id": order_id,
         "type": "earned",
@@ -703,11 +854,11 @@ async def award_loyalty_points(customer_id: str, order_id: str, amount: float, o
 
 @api_router.post("/auth/register", response_model=TokenResponse)
 async def register(user: UserCreate):
-    existing = await db.users.find_one({"email": user.email})
+    existing = await db.users.find_one({"email": user.email}, {"_id": 1})
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    user_id = str(uuid.uuid4())
+    user_id = new_id()
     now = datetime.now(timezone.utc).isoformat()
     
     user_doc = {
@@ -719,6 +870,7 @@ async def register(user: UserCreate):
         "created_at": now
     }
     await db.users.insert_one(user_doc)
+    invalidate_reference_cache()
     
     token = create_token(user_id, user.email, user.role.value)
     return TokenResponse(
@@ -727,11 +879,14 @@ async def register(user: UserCreate):
     )
 
 @api_router.post("/auth/login", response_model=TokenResponse)
-async def login(credentials: UserLogin):
+async def login(credentials: UserLogin, background_tasks: BackgroundTasks):
     user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
     if not user or not verify_password(credentials.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
+    if pwd_context.needs_update(user["password_hash"]):
+        background_tasks.add_task(upgrade_password_hash, user["id"], credentials.password)
+    
     token = create_token(user["id"], user["email"], user["role"])
     return TokenResponse(
         access_token=token,
@@ -889,14 +1044,15 @@ async def update_company_profile(profile: CompanyProfile, current_user: dict = D
     if not profile_data.get("logo_url") and existing_profile.get("logo_url"):
         profile_data["logo_url"] = existing_profile["logo_url"]
     
-    await db.settings.update_one(
+    # Same shape as GET, built from the stored document so clients can verify what was saved
+    settings = await db.settings.find_one_and_update(
         {"id": "default"},
         {"$set": {"settings.company_profile": profile_data, "updated_at": now}},
-        upsert=True
+        projection={"_id": 0, "settings.company_profile": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
     )
-    
-    settings = await db.settings.find_one({"id": "default"}, {"_id": 0})
-    return settings
+    return {"company_profile": settings["settings"]["company_profile"]}
 
 @api_router.get("/settings/company-profile")
 async def get_company_profile(current_user: dict = Depends(get_current_user)):
@@ -1109,31 +1265,27 @@ async def update_loyalty_settings(settings: LoyaltySettingsUpdate, current_user:
     if current_user["role"] not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    now = datetime.now(timezone.utc).isoformat()
-    
-    # Get existing settings
-    existing = await db.loyalty_settings.find_one({"id": "default"})
-    if existing:
-        current_settings = existing.get("settings", {})
-    else:
-        current_settings = LoyaltySettings().model_dump()
-    
     # Update only provided fields
-    update_data = settings.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        if value is not None:
-            current_settings[key] = value
+    update_data = settings.model_dump(exclude_unset=True, exclude_none=True)
+    if not update_data:
+        return await get_loyalty_settings(current_user)
     
-    doc = {
-        "id": "default",
-        "settings": current_settings,
-        "updated_at": now
+    set_ops = {f"settings.{key}": value for key, value in update_data.items()}
+    set_ops["updated_at"] = datetime.now(timezone.utc).isoformat()
+    
+    # First write of the document starts from the program defaults
+    defaults = {
+        f"settings.{key}": value
+        for key, value in LoyaltySettings().model_dump().items()
+        if key not in update_data
     }
     
-    await db.loyalty_settings.update_one(
+    doc = await db.loyalty_settings.find_one_and_update(
         {"id": "default"},
-        {"$set": doc},
-        upsert=True
+        {"$set": set_ops, "$setOnInsert": defaults},
+        projection={"_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
     )
     
     return doc
@@ -1141,12 +1293,33 @@ async def update_loyalty_settings(settings: LoyaltySettingsUpdate, current_user:
 @api_router.get("/customers/{customer_id}/loyalty")
 async def get_customer_loyalty(customer_id: str, current_user: dict = Depends(get_current_user)):
     """Get customer loyalty information including points history"""
-    customer = await db.customers.find_one({"id": customer_id}, {"_id": 0})
-    if not customer:
+    # Customer, program settings and recent transactions in a single round trip
+    pipeline = [
+        {"$match": {"id": customer_id}},
+        {"$limit": 1},
+        {"$project": {"_id": 0, "loyalty_points": 1, "loyalty_excluded": 1, "customer_type": 1}},
+        {"$lookup": {
+            "from": "loyalty_settings",
+            "pipeline": [{"$match": {"id": "default"}}, {"$project": {"_id": 0, "settings": 1}}],
+            "as": "loyalty_settings"
+        }},
+        {"$lookup": {
+            "from": "loyalty_transactions",
+            "pipeline": [
+                {"$match": {"customer_id": customer_id}},
+                {"$sort": {"created_at": -1}},
+                {"$limit": 50},
+                {"$project": {"_id": 0}}
+            ],
+            "as": "transactions"
+        }}
+    ]
+    results = await db.customers.aggregate(pipeline).to_list(1)
+    if not results:
         raise HTTPException(status_code=404, detail="Customer not found")
+    customer = results[0]
     
-    # Get loyalty settings
-    loyalty_settings = await db.loyalty_settings.find_one({"id": "default"}, {"_id": 0})
+    loyalty_settings = customer["loyalty_settings"][0] if customer["loyalty_settings"] else None
     settings = loyalty_settings.get("settings", LoyaltySettings().model_dump()) if loyalty_settings else LoyaltySettings().model_dump()
     
     # Check if customer is excluded
@@ -1159,30 +1332,11 @@ async def get_customer_loyalty(customer_id: str, current_user: dict = Depends(ge
     elif is_business and settings.get("exclude_business_customers", True):
         excluded_reason = "business_customer"
     
-    # Get points history
-    transactions = await db.loyalty_transactions.find(
-        {"customer_id": customer_id}
-    ).sort("created_at", -1).limit(50).to_list(50)
-    
-    for t in transactions:
-        t.pop("_id", None)
+    transactions = customer["transactions"]
     
-    # Calculate tier
+    # Calculate current and next tier
     points = customer.get("loyalty_points", 0)
-    current_tier = None
-    next_tier = None
-    tiers = settings.get("tiers", [])
-    
-    for i, tier in enumerate(sorted(tiers, key=lambda x: x.get("min_points", 0), reverse=True)):
-        if points >= tier.get("min_points", 0):
-            current_tier = tier
-            break
-    
-    # Find next tier
-    for tier in sorted(tiers, key=lambda x: x.get("min_points", 0)):
-        if tier.get("min_points", 0) > points:
-            next_tier = tier
-            break
+    current_tier, next_tier = resolve_loyalty_tiers(settings.get("tiers", []), points)
     
     return {
         "customer_id": customer_id,
@@ -1209,7 +1363,7 @@ async def adjust_loyalty_points(
     if current_user["role"] not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    customer = await db.customers.find_one({"id": customer_id})
+    customer = await db.customers.find_one({"id": customer_id}, {"_id": 0, "loyalty_points": 1})
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     
@@ -1226,7 +1380,7 @@ async def adjust_loyalty_points(
     
     # Record transaction
     transaction = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "customer_id": customer_id,
         "order_id": None,
         "type": "adjustment",
@@ -1324,15 +1478,16 @@ async def create_category(category: CategoryCreate, current_user: dict = Depends
     if current_user["role"] not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    category_id = str(uuid.uuid4())
+    category_id = new_id()
     now = datetime.now(timezone.utc).isoformat()
     
     if category.sort_order == 0:
-        max_order = await db.categories.find_one(sort=[("sort_order", -1)])
+        max_order = await db.categories.find_one({}, {"_id": 0, "sort_order": 1}, sort=[("sort_order", -1)])
         category.sort_order = (max_order["sort_order"] + 1) if max_order else 1
     
-    doc = {"id": category_id, **category.model_dump(), "created_at": now}
+    doc = {"id": category_id, **category.model_dump(), "items_count": 0, "created_at": now}
     await db.categories.insert_one(doc)
+    invalidate_reference_cache()
     doc.pop("_id", None)
     return CategoryResponse(**doc)
 
@@ -1341,8 +1496,29 @@ async def get_categories(
     active_only: bool = True,
     current_user: dict = Depends(get_current_user)
 ):
+    cache_key = ("categories", active_only)
+    cached = cached_reference(cache_key)
+    if cached is not None:
+        return cached
+    
     query = {"is_active": True} if active_only else {}
     categories = await db.categories.find(query, {"_id": 0}).sort("sort_order", 1).to_list(1000)
+    _reference_cache[cache_key] = categories
+    return categories
+
+@api_router.put("/categories/reorder")
+async def reorder_categories(category_orders: List[Dict[str, Any]], current_user: dict = Depends(get_current_user)):
+    if current_user["role"] not in ["admin", "manager"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    if category_orders:
+        await db.categories.bulk_write(
+            [UpdateOne({"id": item["id"]}, {"$set": {"sort_order": item["sort_order"]}}) for item in category_orders],
+            ordered=False
+        )
+        invalidate_reference_cache()
+    
+    categories = await db.categories.find({}, {"_id": 0}).sort("sort_order", 1).to_list(1000)
     return [CategoryResponse(**c) for c in categories]
 
 @api_router.get("/categories/{category_id}", response_model=CategoryResponse)
@@ -1361,11 +1537,17 @@ async def update_category(category_id: str, update: CategoryUpdate, current_user
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data provided")
     
-    result = await db.categories.update_one({"id": category_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    category = await db.categories.find_one_and_update(
+        {"id": category_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    _category_name_cache.pop(category_id, None)
+    invalidate_reference_cache()
+    if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
-    category = await db.categories.find_one({"id": category_id}, {"_id": 0})
     return CategoryResponse(**category)
 
 @api_router.delete("/categories/{category_id}")
@@ -1373,35 +1555,29 @@ async def delete_category(category_id: str, current_user: dict = Depends(get_cur
     if current_user["role"] not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    items_count = await db.items.count_documents({"category_id": category_id})
+    category = await db.categories.find_one({"id": category_id}, {"_id": 0, "items_count": 1})
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+    
+    items_count = category.get("items_count")
+    if items_count is None:
+        items_count = await db.items.count_documents({"category_id": category_id})
     if items_count > 0:
         raise HTTPException(status_code=400, detail=f"Cannot delete category with {items_count} items")
     
     result = await db.categories.delete_one({"id": category_id})
+    _category_name_cache.pop(category_id, None)
+    invalidate_reference_cache()
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Category not found")
     return {"message": "Category deleted"}
 
-@api_router.put("/categories/reorder")
-async def reorder_categories(category_orders: List[Dict[str, Any]], current_user: dict = Depends(get_current_user)):
-    if current_user["role"] not in ["admin", "manager"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    for item in category_orders:
-        await db.categories.update_one(
-            {"id": item["id"]},
-            {"$set": {"sort_order": item["sort_order"]}}
-        )
-    
-    categories = await db.categories.find({}, {"_id": 0}).sort("sort_order", 1).to_list(1000)
-    return [CategoryResponse(**c) for c in categories]
-
 
 # ======================== CUSTOMER ROUTES ========================
 
 @api_router.post("/customers", response_model=CustomerResponse)
 async def create_customer(customer: CustomerCreate, current_user: dict = Depends(get_current_user)):
-    customer_id = str(uuid.uuid4())
+    customer_id = new_id()
     now = datetime.now(timezone.utc).isoformat()
     
     doc = {
@@ -1415,28 +1591,71 @@ async def create_customer(customer: CustomerCreate, current_user: dict = Depends
         "created_at": now
     }
     await db.customers.insert_one(doc)
+    invalidate_metrics_cache()
     doc.pop("_id", None)
     return CustomerResponse(**doc)
 
+# Only the fields CustomerResponse serialises
+CUSTOMER_LIST_PROJECTION = {"_id": 0, **dict.fromkeys(CustomerResponse.model_fields, 1)}
+
 @api_router.get("/customers", response_model=List[CustomerResponse])
 async def get_customers(
     search: Optional[str] = None,
     customer_type: Optional[CustomerType] = None,
+    limit: int = Query(default=1000, ge=1, le=1000),
+    skip: int = Query(default=0, ge=0),
     current_user: dict = Depends(get_current_user)
 ):
     query = {}
-    if search:
-        query["$or"] = [
-            {"name": {"$regex": search, "$options": "i"}},
-            {"phone": {"$regex": search, "$options": "i"}},
-            {"email": {"$regex": search, "$options": "i"}},
-            {"business_info.company_name": {"$regex": search, "$options": "i"}}
-        ]
     if customer_type:
         query["customer_type"] = customer_type.value
     
-    customers = await db.customers.find(query, {"_id": 0}).to_list(1000)
-    return [CustomerResponse(**c) for c in customers]
+    if not search:
+        # Stream straight from the cursor instead of buffering the whole page
+        cursor = db.customers.find(query, CUSTOMER_LIST_PROJECTION).sort("created_at", 1).skip(skip).limit(limit)
+        return await json_array_response(cursor, CustomerResponse)
+    
+    # Whole-word matches come from the text index, ranked by relevance. Only the
+    # first skip + limit can land on this page, so fetch no more than that.
+    # The input is searched as one quoted phrase, so its quotes and a leading "-"
+    # aren't read as phrase and negation operators.
+    window = skip + limit
+    phrase = search.replace('"', '').strip()
+    text_hits = await db.customers.find(
+        {**query, "$text": {"$search": f'"{phrase}"'}},
+        {**CUSTOMER_LIST_PROJECTION, "score": {"$meta": "textScore"}}
+    ).sort([("score", {"$meta": "textScore"})]).limit(window).to_list(window) if phrase else []
+    
+    async def results():
+        for customer in text_hits[skip:]:
+            yield customer
+        remaining = limit - max(0, len(text_hits) - skip)
+        if remaining <= 0:
+            return
+        # A short text result set is complete, so partial matches while typing
+        # ("jo", "555-01") follow it, without repeating any text hit
+        pattern = re.escape(search)
+        substring_query = {
+            **query,
+            "id": {"$nin": [c["id"] for c in text_hits]},
+            "$or": [
+                {"name": {"$regex": pattern, "$options": "i"}},
+                {"phone": {"$regex": pattern, "$options": "i"}},
+                {"email": {"$regex": pattern, "$options": "i"}},
+                {"business_info.company_name": {"$regex": pattern, "$options": "i"}}
+            ]
+        }
+        cursor = db.customers.find(substring_query, CUSTOMER_LIST_PROJECTION).sort("created_at", 1)
+        async for customer in cursor.skip(max(0, skip - len(text_hits))).limit(remaining):
+            yield customer
+    
+    return await json_array_response(results(), CustomerResponse)
+
+@api_router.get("/customers/count")
+async def get_customers_count(current_user: dict = Depends(get_current_user)):
+    """Get the approximate total number of customers from collection metadata"""
+    total = await db.customers.estimated_document_count()
+    return {"total": total}
 
 @api_router.get("/customers/{customer_id}", response_model=CustomerResponse)
 async def get_customer(customer_id: str, current_user: dict = Depends(get_current_user)):
@@ -1449,59 +1668,84 @@ async def get_customer(customer_id: str, current_user: dict = Depends(get_curren
 async def get_customer_orders(
     customer_id: str,
     active_only: bool = False,
+    limit: int = Query(default=100, ge=1, le=500),
+    skip: int = Query(default=0, ge=0),
     current_user: dict = Depends(get_current_user)
 ):
     query = {"customer_id": customer_id}
     if active_only:
         query["status"] = {"$in": ["cleaning", "ready"]}
     
-    orders = await db.orders.find(query, {"_id": 0}).sort("timestamps.created_at", -1).to_list(100)
+    orders = await db.orders.find(
+        query,
+        {"_id": 0, "id": 1, "order_number": 1, "status": 1, "items": 1, "total": 1, "payment_status": 1, "timestamps": 1}
+    ).sort("timestamps.created_at", -1).skip(skip).limit(limit).to_list(limit)
     return orders
 
 @api_router.get("/customers/{customer_id}/stats")
 async def get_customer_stats(customer_id: str, current_user: dict = Depends(get_current_user)):
-    customer = await db.customers.find_one({"id": customer_id}, {"_id": 0})
+    # Compute order statistics server-side in one round-trip
+    pipeline = [
+        {"$match": {"customer_id": customer_id}},
+        {"$facet": {
+            "counts": [
+                {"$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "active": {"$sum": {"$cond": [{"$in": ["$status", ["cleaning", "ready"]]}, 1, 0]}},
+                    "completed": {"$sum": {"$cond": [{"$in": ["$status", ["collected", "delivered"]]}, 1, 0]}}
+                }}
+            ],
+            "total_items": [
+                {"$unwind": "$items"},
+                {"$group": {"_id": None, "quantity": {"$sum": "$items.quantity"}}}
+            ],
+            "top_items": [
+                {"$unwind": "$items"},
+                {"$group": {"_id": "$items.item_name", "quantity": {"$sum": "$items.quantity"}}},
+                {"$sort": {"quantity": -1, "_id": 1}},
+                {"$limit": 5}
+            ],
+            "monthly_spending": [
+                {"$match": {"status": {"$in": ["collected", "delivered"]}, "timestamps.created_at": {"$type": "string"}}},
+                {"$group": {
+                    "_id": {"$substrCP": ["$timestamps.created_at", 0, 7]},  # YYYY-MM
+                    "amount": {"$sum": {"$ifNull": ["$total", 0]}}
+                }},
+                {"$sort": {"_id": -1}},
+                {"$limit": 6}
+            ]
+        }}
+    ]
+    # The customer read and the order aggregation are independent, so run them concurrently
+    customer, results = await asyncio.gather(
+        db.customers.find_one(
+            {"id": customer_id},
+            {"_id": 0, "total_spent": 1, "average_order_value": 1, "loyalty_points": 1, "last_order_date": 1, "created_at": 1}
+        ),
+        db.orders.aggregate(pipeline).to_list(1)
+    )
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
+    result = results[0]
     
-    # Get order statistics
-    orders = await db.orders.find({"customer_id": customer_id}, {"_id": 0}).to_list(1000)
-    
-    active_orders = [o for o in orders if o.get("status") in ["cleaning", "ready"]]
-    completed_orders = [o for o in orders if o.get("status") in ["collected", "delivered"]]
-    
-    # Calculate stats
-    total_items = sum(sum(i["quantity"] for i in o.get("items", [])) for o in orders)
-    
-    # Most ordered items
-    item_counts = {}
-    for order in orders:
-        for item in order.get("items", []):
-            name = item["item_name"]
-            if name not in item_counts:
-                item_counts[name] = 0
-            item_counts[name] += item["quantity"]
-    
-    top_items = sorted(item_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    
-    # Monthly spending (last 6 months)
-    from collections import defaultdict
-    monthly_spending = defaultdict(float)
-    for order in completed_orders:
-        date = order.get("timestamps", {}).get("created_at", "")[:7]  # YYYY-MM
-        if date:
-            monthly_spending[date] += order.get("total", 0)
+    counts = result["counts"][0] if result["counts"] else {}
+    total_items = result["total_items"][0]["quantity"] if result["total_items"] else 0
+    monthly_spending = [
+        {"month": m["_id"], "amount": m["amount"]}
+        for m in reversed(result["monthly_spending"]) if m["_id"]
+    ]
     
     return {
-        "total_orders": len(orders),
-        "active_orders": len(active_orders),
-        "completed_orders": len(completed_orders),
+        "total_orders": counts.get("total", 0),
+        "active_orders": counts.get("active", 0),
+        "completed_orders": counts.get("completed", 0),
         "total_spent": customer.get("total_spent", 0),
         "average_order_value": customer.get("average_order_value", 0),
         "loyalty_points": customer.get("loyalty_points", 0),
         "total_items_cleaned": total_items,
-        "top_items": [{"name": n, "quantity": q} for n, q in top_items],
-        "monthly_spending": [{"month": m, "amount": a} for m, a in sorted(monthly_spending.items())[-6:]],
+        "top_items": [{"name": t["_id"], "quantity": t["quantity"]} for t in result["top_items"]],
+        "monthly_spending": monthly_spending,
         "last_order_date": customer.get("last_order_date"),
         "member_since": customer.get("created_at")
     }
@@ -1523,11 +1767,15 @@ async def update_customer(customer_id: str, update: CustomerUpdate, current_user
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data provided")
     
-    result = await db.customers.update_one({"id": customer_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    customer = await db.customers.find_one_and_update(
+        {"id": customer_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    customer = await db.customers.find_one({"id": customer_id}, {"_id": 0})
     return CustomerResponse(**customer)
 
 @api_router.delete("/customers/{customer_id}")
@@ -1535,8 +1783,17 @@ async def delete_customer(customer_id: str, current_user: dict = Depends(get_cur
     result = await db.customers.delete_one({"id": customer_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Customer not found")
+    invalidate_metrics_cache()
     return {"message": "Customer deleted"}
 
+@api_router.post("/customers/bulk-delete")
+async def bulk_delete_customers(ids: List[str], current_user: dict = Depends(get_current_user)):
+    """Delete several customers in one request"""
+    result = await db.customers.delete_many({"id": {"$in": ids}})
+    if result.deleted_count:
+        invalidate_metrics_cache()
+    return {"message": "Customers deleted", "deleted": result.deleted_count}
+
 
 # ======================== ITEM ROUTES ========================
 
@@ -1545,25 +1802,28 @@ async def create_item(item: ItemCreate, current_user: dict = Depends(get_current
     if current_user["role"] not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    item_id = str(uuid.uuid4())
+    item_id = new_id()
     now = datetime.now(timezone.utc).isoformat()
     
-    category = await db.categories.find_one({"id": item.category_id}, {"_id": 0})
-    category_name = category["name"] if category else None
-    
-    parent_name = None
-    if item.parent_id:
-        parent = await db.items.find_one({"id": item.parent_id}, {"_id": 0})
-        parent_name = parent["name"] if parent else None
+    category_name = await get_category_name(item.category_id)
+    parent_name = await get_item_name(item.parent_id) if item.parent_id else None
     
     doc = {
         "id": item_id,
         **item.model_dump(),
         "category_name": category_name,
         "parent_name": parent_name,
+        "children_count": 0,
         "created_at": now
     }
-    await db.items.insert_one(doc)
+    writes = [
+        db.items.insert_one(doc),
+        db.categories.update_one({"id": item.category_id}, {"$inc": {"items_count": 1}})
+    ]
+    if item.parent_id:
+        writes.append(db.items.update_one({"id": item.parent_id}, {"$inc": {"children_count": 1}}))
+    await asyncio.gather(*writes)
+    invalidate_reference_cache()
     doc.pop("_id", None)
     return ItemResponse(**doc)
 
@@ -1575,6 +1835,11 @@ async def get_items(
     parents_only: bool = False,
     current_user: dict = Depends(get_current_user)
 ):
+    cache_key = ("items", category_id, active_only, include_children, parents_only)
+    cached = cached_reference(cache_key)
+    if cached is not None:
+        return cached
+    
     query = {}
     if category_id:
         query["category_id"] = category_id
@@ -1583,6 +1848,29 @@ async def get_items(
     if parents_only:
         query["parent_id"] = None
     
+    if parents_only and include_children:
+        # Inline each parent's children in the same round trip
+        children_match = {"$expr": {"$eq": ["$parent_id", "$$parent_id"]}}
+        if active_only:
+            children_match["is_active"] = True
+        pipeline = [
+            {"$match": query},
+            {"$limit": 1000},
+            {"$lookup": {
+                "from": "items",
+                "let": {"parent_id": "$id"},
+                "pipeline": [{"$match": children_match}, {"$project": {"_id": 0}}],
+                "as": "children"
+            }},
+            {"$project": {"_id": 0}}
+        ]
+        result = await db.items.aggregate(pipeline).to_list(1000)
+        for parent in result:
+            parent["has_children"] = len(parent["children"]) > 0
+        
+        _reference_cache[cache_key] = result
+        return result
+    
     items = await db.items.find(query, {"_id": 0}).to_list(1000)
     
     # Always fetch all items to check which have children
@@ -1595,26 +1883,42 @@ async def get_items(
             parent_ids_with_children.add(item["parent_id"])
     
     if include_children and not parents_only:
-        parent_items = [i for i in items if not i.get("parent_id")]
-        child_items = [i for i in items if i.get("parent_id")]
+        # Group children by parent in one pass
+        parent_items = []
+        by_parent = {}
+        for i in items:
+            parent_id = i.get("parent_id")
+            if parent_id:
+                by_parent.setdefault(parent_id, []).append(i)
+            else:
+                parent_items.append(i)
         
         for parent in parent_items:
-            children = [c for c in child_items if c.get("parent_id") == parent["id"]]
+            children = by_parent.get(parent["id"], [])
             parent["children"] = children
             parent["has_children"] = len(children) > 0
         
-        return [ItemResponse(**i) for i in parent_items]
-    
-    # Mark has_children for all items
-    for item in items:
-        item["has_children"] = item["id"] in parent_ids_with_children
+        result = parent_items
+    else:
+        # Mark has_children for all items
+        for item in items:
+            item["has_children"] = item["id"] in parent_ids_with_children
+        
+        result = items
     
-    return [ItemResponse(**i) for i in items]
+    _reference_cache[cache_key] = result
+    return result
 
 @api_router.get("/items/children/{parent_id}")
 async def get_item_children(parent_id: str, current_user: dict = Depends(get_current_user)):
     """Get child items for a parent item"""
+    cache_key = ("item_children", parent_id)
+    cached = cached_reference(cache_key)
+    if cached is not None:
+        return cached
+    
     children = await db.items.find({"parent_id": parent_id, "is_active": True}, {"_id": 0}).to_list(100)
+    _reference_cache[cache_key] = children
     return children
 
 @api_router.get("/items/check-has-children/{item_id}")
@@ -1626,21 +1930,29 @@ async def check_item_has_children(item_id: str, current_user: dict = Depends(get
 @api_router.get("/items/all")
 async def get_all_items(
     active_only: bool = True,
+    limit: int = Query(default=1000, ge=1, le=1000),
+    skip: int = Query(default=0, ge=0),
     current_user: dict = Depends(get_current_user)
 ):
+    cache_key = ("all_items", active_only, limit, skip)
+    cached = cached_reference(cache_key)
+    if cached is not None:
+        return cached
+    
     query = {"is_active": True} if active_only else {}
-    items = await db.items.find(query, {"_id": 0}).to_list(1000)
+    items = await db.items.find(query, {"_id": 0}).sort("created_at", 1).skip(skip).limit(limit).to_list(limit)
     
-    # Check which items have children
-    parent_ids_with_children = set()
-    for item in items:
-        if item.get("parent_id"):
-            parent_ids_with_children.add(item["parent_id"])
+    # Children may fall on another page, so look up parents with children server-side
+    parent_ids_with_children = set(await db.items.distinct("parent_id", {**query, "parent_id": {"$ne": None}}))
     
     for item in items:
         item["has_children"] = item["id"] in parent_ids_with_children
     
-    return [ItemResponse(**i) for i in items]
+    # Validated once as the cache fills, so older documents still get ItemResponse
+    # defaults; hits return the plain dicts without building models again
+    result = [ItemResponse.model_validate(i).model_dump(mode="json") for i in items]
+    _reference_cache[cache_key] = result
+    return result
 
 @api_router.get("/items/{item_id}", response_model=ItemResponse)
 async def get_item(item_id: str, current_user: dict = Depends(get_current_user)):
@@ -1667,21 +1979,39 @@ async def update_item(item_id: str, update: ItemUpdate, current_user: dict = Dep
         update_data["volume_discounts"] = [vd.model_dump() if hasattr(vd, "model_dump") else vd for vd in update_data["volume_discounts"]]
     
     if "category_id" in update_data:
-        category = await db.categories.find_one({"id": update_data["category_id"]}, {"_id": 0})
-        update_data["category_name"] = category["name"] if category else None
+        update_data["category_name"] = await get_category_name(update_data["category_id"])
     
     if "parent_id" in update_data:
         if update_data["parent_id"]:
-            parent = await db.items.find_one({"id": update_data["parent_id"]}, {"_id": 0})
-            update_data["parent_name"] = parent["name"] if parent else None
+            update_data["parent_name"] = await get_item_name(update_data["parent_id"])
         else:
             update_data["parent_name"] = None
     
-    result = await db.items.update_one({"id": item_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    # Read the previous version so category/parent counters can be moved
+    previous = await db.items.find_one_and_update(
+        {"id": item_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not previous:
         raise HTTPException(status_code=404, detail="Item not found")
+    item = {**previous, **update_data}
+    _item_name_cache.pop(item_id, None)
+    invalidate_reference_cache()
+    
+    counter_updates = []
+    if previous.get("category_id") != item.get("category_id"):
+        counter_updates.append(db.categories.update_one({"id": previous.get("category_id")}, {"$inc": {"items_count": -1}}))
+        counter_updates.append(db.categories.update_one({"id": item.get("category_id")}, {"$inc": {"items_count": 1}}))
+    if previous.get("parent_id") != item.get("parent_id"):
+        if previous.get("parent_id"):
+            counter_updates.append(db.items.update_one({"id": previous["parent_id"]}, {"$inc": {"children_count": -1}}))
+        if item.get("parent_id"):
+            counter_updates.append(db.items.update_one({"id": item["parent_id"]}, {"$inc": {"children_count": 1}}))
+    if counter_updates:
+        await asyncio.gather(*counter_updates)
     
-    item = await db.items.find_one({"id": item_id}, {"_id": 0})
     return ItemResponse(**item)
 
 @api_router.delete("/items/{item_id}")
@@ -1689,19 +2019,42 @@ async def delete_item(item_id: str, current_user: dict = Depends(get_current_use
     if current_user["role"] not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    children_count = await db.items.count_documents({"parent_id": item_id})
+    item = await db.items.find_one(
+        {"id": item_id},
+        {"_id": 0, "category_id": 1, "parent_id": 1, "children_count": 1}
+    )
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    
+    children_count = item.get("children_count")
+    if children_count is None:
+        children_count = await db.items.count_documents({"parent_id": item_id})
     if children_count > 0:
         raise HTTPException(status_code=400, detail=f"Cannot delete item with {children_count} child items")
     
     result = await db.items.delete_one({"id": item_id})
+    _item_name_cache.pop(item_id, None)
+    invalidate_reference_cache()
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Item not found")
+    
+    counter_updates = [db.categories.update_one({"id": item.get("category_id")}, {"$inc": {"items_count": -1}})]
+    if item.get("parent_id"):
+        counter_updates.append(db.items.update_one({"id": item["parent_id"]}, {"$inc": {"children_count": -1}}))
+    await asyncio.gather(*counter_updates)
     return {"message": "Item deleted"}
 
 @api_router.get("/item-categories")
 async def get_item_categories(current_user: dict = Depends(get_current_user)):
+    cache_key = ("item_categories",)
+    cached = cached_reference(cache_key)
+    if cached is not None:
+        return cached
+    
     categories = await db.items.distinct("category_name")
-    return {"categories": [c for c in categories if c]}
+    result = {"categories": [c for c in categories if c]}
+    _reference_cache[cache_key] = result
+    return result
 
 
 # ======================== ORDER ROUTES ========================
@@ -1709,7 +2062,10 @@ async def get_item_categories(current_user: dict = Depends(get_current_user)):
 @api_router.post("/orders", response_model=OrderResponse)
 async def create_order(order: OrderCreate, current_user: dict = Depends(get_current_user)):
     # Check if customer is blacklisted
-    customer = await db.customers.find_one({"id": order.customer_id}, {"_id": 0})
+    customer = await db.customers.find_one(
+        {"id": order.customer_id},
+        {"_id": 0, "is_blacklisted": 1, "customer_type": 1, "loyalty_points": 1}
+    )
     if customer and customer.get("is_blacklisted"):
         raise HTTPException(status_code=400, detail="Customer is blacklisted and cannot place orders")
     
@@ -1723,7 +2079,7 @@ async def create_order(order: OrderCreate, current_user: dict = Depends(get_curr
         if overdue_invoices > 0:
             overdue_warning = f"Warning: This customer has {overdue_invoices} overdue invoice(s)"
     
-    order_id = str(uuid.uuid4())
+    order_id = new_id()
     order_number = generate_order_number()
     now = datetime.now(timezone.utc).isoformat()
     
@@ -1749,21 +2105,16 @@ async def create_order(order: OrderCreate, current_user: dict = Depends(get_curr
     loyalty_points_redeemed = order.loyalty_points_redeemed or 0
     loyalty_discount_amount = order.loyalty_discount_amount or 0.0
     
+    transaction = None
     if loyalty_points_redeemed > 0:
         # Validate redemption
         current_points = customer.get("loyalty_points", 0) if customer else 0
         if loyalty_points_redeemed > current_points:
             raise HTTPException(status_code=400, detail="Insufficient loyalty points")
         
-        # Deduct points from customer
-        await db.customers.update_one(
-            {"id": order.customer_id},
-            {"$inc": {"loyalty_points": -loyalty_points_redeemed}}
-        )
-        
-        # Record redemption transaction
+        # Redemption transaction, written together with the order below
         transaction = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "customer_id": order.customer_id,
             "order_id": order_id,
             "type": "redeemed",
@@ -1772,7 +2123,6 @@ async def create_order(order: OrderCreate, current_user: dict = Depends(get_curr
             "balance_after": current_points - loyalty_points_redeemed,
             "created_at": now
         }
-        await db.loyalty_transactions.insert_one(transaction)
     
     timestamps = {
         "created_at": now,
@@ -1813,22 +2163,38 @@ async def create_order(order: OrderCreate, current_user: dict = Depends(get_curr
         "created_by": current_user["id"],
         "overdue_warning": overdue_warning
     }
-    await db.orders.insert_one(doc)
     
-    # Update customer stats
-    new_total_spent = (customer.get("total_spent", 0) if customer else 0) + order.total
-    new_total_orders = (customer.get("total_orders", 0) if customer else 0) + 1
-    new_avg = new_total_spent / new_total_orders if new_total_orders > 0 else 0
+    # Update customer stats and deduct redeemed points atomically on the server
+    stats_update = {
+        "total_orders": {"$add": [{"$ifNull": ["$total_orders", 0]}, 1]},
+        "total_spent": {"$add": [{"$ifNull": ["$total_spent", 0]}, order.total]},
+        "last_order_date": now
+    }
+    if loyalty_points_redeemed > 0:
+        stats_update["loyalty_points"] = {"$subtract": [{"$ifNull": ["$loyalty_points", 0]}, loyalty_points_redeemed]}
+    customer_update = [
+        {"$set": stats_update},
+        {"$set": {"average_order_value": {"$round": [{"$divide": ["$total_spent", "$total_orders"]}, 2]}}}
+    ]
     
-    await db.customers.update_one(
-        {"id": order.customer_id},
-        {"$set": {
-            "total_orders": new_total_orders,
-            "total_spent": new_total_spent,
-            "average_order_value": round(new_avg, 2),
-            "last_order_date": now
-        }}
-    )
+    if MONGO_TRANSACTIONS:
+        # All-or-nothing: redeemed points are never deducted without the order being stored
+        async with await client.start_session() as session:
+            async with session.start_transaction():
+                await db.orders.insert_one(doc, session=session)
+                await db.customers.update_one({"id": order.customer_id}, customer_update, session=session)
+                if transaction:
+                    await db.loyalty_transactions.insert_one(transaction, session=session)
+    else:
+        # The writes are independent of each other, so issue them concurrently
+        writes = [
+            db.orders.insert_one(doc),
+            db.customers.update_one({"id": order.customer_id}, customer_update)
+        ]
+        if transaction:
+            writes.append(db.loyalty_transactions.insert_one(transaction))
+        await asyncio.gather(*writes)
+    invalidate_metrics_cache()
     
     doc.pop("_id", None)
     doc.pop("timestamps", None)  # Remove timestamps from doc to avoid duplicate
@@ -1865,22 +2231,41 @@ async def get_orders(
         else:
             query["timestamps.created_at"] = {"$lte": date_to}
     
-    orders = await db.orders.find(query, {"_id": 0}).sort("timestamps.created_at", -1).to_list(limit)
-    result = []
-    for o in orders:
-        ts = o.pop("timestamps", {})
-        result.append(OrderResponse(**o, timestamps=OrderTimestamps(**ts)))
-    return result
+    # Stream straight from the cursor instead of buffering the whole page
+    cursor = db.orders.find(query, {"_id": 0}).sort("timestamps.created_at", -1).limit(limit)
+    return await json_array_response(cursor, OrderResponse)
 
 @api_router.get("/orders/by-status")
 async def get_orders_by_status(current_user: dict = Depends(get_current_user)):
     """Get orders grouped by status for POS tabs"""
-    cleaning_orders = await db.orders.find({"status": "cleaning"}, {"_id": 0}).sort("timestamps.created_at", -1).to_list(500)
-    ready_orders = await db.orders.find({"status": "ready"}, {"_id": 0}).sort("timestamps.ready_at", -1).to_list(500)
+    # Fields shown on the POS tab cards and the order detail dialog
+    projection = {
+        "_id": 0, "id": 1, "order_number": 1, "customer_id": 1, "customer_name": 1, "customer_phone": 1,
+        "items": 1, "subtotal": 1, "tax": 1, "total": 1, "status": 1, "payment_status": 1,
+        "payment_method": 1, "timestamps": 1
+    }
+    pipeline = [
+        {"$match": {"status": {"$in": ["cleaning", "ready"]}}},
+        {"$facet": {
+            "cleaning": [
+                {"$match": {"status": "cleaning"}},
+                {"$sort": {"timestamps.created_at": -1}},
+                {"$limit": 500},
+                {"$project": projection}
+            ],
+            "ready": [
+                {"$match": {"status": "ready"}},
+                {"$sort": {"timestamps.ready_at": -1}},
+                {"$limit": 500},
+                {"$project": projection}
+            ]
+        }}
+    ]
+    result = (await db.orders.aggregate(pipeline).to_list(1))[0]
     
     return {
-        "cleaning": cleaning_orders,
-        "ready": ready_orders
+        "cleaning": result["cleaning"],
+        "ready": result["ready"]
     }
 
 @api_router.get("/orders/{order_id}", response_model=OrderResponse)
@@ -1891,22 +2276,21 @@ async def get_order(order_id: str, current_user: dict = Depends(get_current_user
     ts = order.pop("timestamps", {})
     return OrderResponse(**order, timestamps=OrderTimestamps(**ts))
 
+# Timestamp recorded when an order enters each status
+STATUS_TIMESTAMP_FIELDS = {
+    OrderStatus.CLEANING: "timestamps.cleaning_at",
+    OrderStatus.READY: "timestamps.ready_at",
+    OrderStatus.COLLECTED: "timestamps.collected_at",
+    OrderStatus.DELIVERED: "timestamps.delivered_at",
+    OrderStatus.CANCELLED: "timestamps.cancelled_at"
+}
+
 @api_router.put("/orders/{order_id}/status", response_model=OrderResponse)
 async def update_order_status(order_id: str, update: OrderStatusUpdate, current_user: dict = Depends(get_current_user)):
     now = datetime.now(timezone.utc).isoformat()
     
     # Determine timestamp field to update
-    timestamp_field = None
-    if update.status == OrderStatus.CLEANING:
-        timestamp_field = "timestamps.cleaning_at"
-    elif update.status == OrderStatus.READY:
-        timestamp_field = "timestamps.ready_at"
-    elif update.status == OrderStatus.COLLECTED:
-        timestamp_field = "timestamps.collected_at"
-    elif update.status == OrderStatus.DELIVERED:
-        timestamp_field = "timestamps.delivered_at"
-    elif update.status == OrderStatus.CANCELLED:
-        timestamp_field = "timestamps.cancelled_at"
+    timestamp_field = STATUS_TIMESTAMP_FIELDS.get(update.status)
     
     update_data = {"status": update.status.value}
     if timestamp_field:
@@ -1914,11 +2298,15 @@ async def update_order_status(order_id: str, update: OrderStatusUpdate, current_
     if update.notes:
         update_data["notes"] = update.notes
     
-    result = await db.orders.update_one({"id": order_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    order = await db.orders.find_one_and_update(
+        {"id": order_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
-    order = await db.orders.find_one({"id": order_id}, {"_id": 0})
     ts = order.pop("timestamps", {})
     return OrderResponse(**order, timestamps=OrderTimestamps(**ts))
 
@@ -1946,7 +2334,10 @@ async def get_deliveries(
     if driver_id:
         query["delivery_info.driver_id"] = driver_id
     
-    orders = await db.orders.find(query, {"_id": 0}).sort("timestamps.created_at", -1).to_list(500)
+    orders = await db.orders.find(
+        query,
+        {"_id": 0, "id": 1, "order_number": 1, "customer_name": 1, "customer_phone": 1, "status": 1, "delivery_info": 1, "total": 1, "timestamps": 1}
+    ).sort("timestamps.created_at", -1).to_list(500)
     
     deliveries = []
     for order in orders:
@@ -1970,22 +2361,30 @@ async def update_order_delivery(
     delivery_info: DeliveryInfo,
     current_user: dict = Depends(get_current_user)
 ):
-    result = await db.orders.update_one(
+    order = await db.orders.find_one_and_update(
         {"id": order_id},
-        {"$set": {"delivery_info": delivery_info.model_dump()}}
+        {"$set": {"delivery_info": delivery_info.model_dump()}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.matched_count == 0:
+    if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
-    order = await db.orders.find_one({"id": order_id}, {"_id": 0})
     ts = order.pop("timestamps", {})
     return OrderResponse(**order, timestamps=OrderTimestamps(**ts))
 
 @api_router.get("/drivers")
 async def get_drivers(current_user: dict = Depends(get_current_user)):
-    users = await db.users.find({}, {"_id": 0, "password_hash": 0}).to_list(100)
-    return [{"id": u["id"], "name": u["name"]} for u in users]
+    cache_key = ("drivers",)
+    cached = cached_reference(cache_key)
+    if cached is not None:
+        return cached
+    
+    users = await db.users.find({}, {"_id": 0, "id": 1, "name": 1}).to_list(100)
+    result = [{"id": u["id"], "name": u["name"]} for u in users]
+    _reference_cache[cache_key] = result
+    return result
 
 
 # ======================== INVOICE ROUTES ========================
@@ -2018,7 +2417,7 @@ async def create_invoice(invoice_data: InvoiceCreate, current_user: dict = Depen
         if order.get("invoice_id"):
             raise HTTPException(status_code=400, detail=f"Order {order['order_number']} is already on an invoice")
     
-    invoice_id = str(uuid.uuid4())
+    invoice_id = new_id()
     invoice_number = generate_invoice_number()
     now = datetime.now(timezone.utc).isoformat()
     
@@ -2116,31 +2515,38 @@ async def get_invoice_summary(current_user: dict = Depends(get_current_user)):
         {"$set": {"status": "overdue"}}
     )
     
-    all_invoices = await db.invoices.find({}, {"_id": 0}).to_list(10000)
-    
-    total_invoiced = sum(i["total"] for i in all_invoices)
-    total_paid = sum(i["amount_paid"] for i in all_invoices)
-    total_outstanding = sum(i["amount_due"] for i in all_invoices if i["status"] != "paid")
+    cursor = db.invoices.find(
+        {}, {"_id": 0, "total": 1, "amount_paid": 1, "amount_due": 1, "status": 1}
+    )
     
+    total_invoiced = 0
+    total_paid = 0
+    total_outstanding = 0
+    total_invoices = 0
     status_counts = {}
-    for inv in all_invoices:
+    # Reduce as documents arrive instead of materialising every invoice
+    async for inv in cursor:
         status = inv["status"]
+        total_invoices += 1
+        total_invoiced += inv["total"]
+        total_paid += inv["amount_paid"]
+        if status != "paid":
+            total_outstanding += inv["amount_due"]
         if status not in status_counts:
             status_counts[status] = {"count": 0, "amount": 0}
         status_counts[status]["count"] += 1
         status_counts[status]["amount"] += inv["amount_due"] if status != "paid" else inv["total"]
     
-    overdue_invoices = [i for i in all_invoices if i["status"] == "overdue"]
-    overdue_total = sum(i["amount_due"] for i in overdue_invoices)
+    overdue = status_counts.get("overdue", {"count": 0, "amount": 0})
     
     return {
         "total_invoiced": total_invoiced,
         "total_paid": total_paid,
         "total_outstanding": total_outstanding,
-        "overdue_count": len(overdue_invoices),
-        "overdue_total": overdue_total,
+        "overdue_count": overdue["count"],
+        "overdue_total": overdue["amount"],
         "by_status": status_counts,
-        "total_invoices": len(all_invoices)
+        "total_invoices": total_invoices
     }
 
 @api_router.get("/invoices/{invoice_id}")
@@ -2161,7 +2567,7 @@ async def record_invoice_payment(
     if current_user["role"] not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    invoice = await db.invoices.find_one({"id": invoice_id})
+    invoice = await db.invoices.find_one({"id": invoice_id}, {"_id": 0, "status": 1, "amount_paid": 1, "total": 1})
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     
@@ -2171,7 +2577,7 @@ async def record_invoice_payment(
     now = datetime.now(timezone.utc).isoformat()
     
     payment_record = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "amount": payment.amount,
         "payment_method": payment.payment_method,
         "notes": payment.notes,
@@ -2202,6 +2608,7 @@ async def record_invoice_payment(
             {"invoice_id": invoice_id},
             {"$set": {"payment_status": "completed"}}
         )
+        invalidate_metrics_cache()
     
     invoice = await db.invoices.find_one({"id": invoice_id}, {"_id": 0})
     return invoice
@@ -2378,6 +2785,13 @@ async def get_garment_labels(
 
 # ======================== PAYMENT ROUTES ========================
 
+@lru_cache(maxsize=16)
+def get_stripe_checkout(webhook_url: str = ""):
+    """Get a StripeCheckout client, reused across requests for the same webhook URL"""
+    from emergentintegrations.payments.stripe.checkout import StripeCheckout
+    
+    return StripeCheckout(api_key=os.environ.get("STRIPE_API_KEY"), webhook_url=webhook_url)
+
 @api_router.post("/payments", response_model=PaymentResponse)
 async def create_payment(payment: PaymentCreate, request: Request, current_user: dict = Depends(get_current_user)):
     order = await db.orders.find_one({"id": payment.order_id}, {"_id": 0})
@@ -2392,7 +2806,7 @@ async def create_payment(payment: PaymentCreate, request: Request, current_user:
         if order.get("customer_type") != "business":
             raise HTTPException(status_code=400, detail="Invoice payment only available for business customers")
     
-    payment_id = str(uuid.uuid4())
+    payment_id = new_id()
     now = datetime.now(timezone.utc).isoformat()
     
     payment_doc = {
@@ -2407,13 +2821,12 @@ async def create_payment(payment: PaymentCreate, request: Request, current_user:
     }
     
     if payment.payment_method == PaymentMethod.CARD:
-        from emergentintegrations.payments.stripe.checkout import StripeCheckout, CheckoutSessionRequest
+        from emergentintegrations.payments.stripe.checkout import CheckoutSessionRequest
         
-        api_key = os.environ.get("STRIPE_API_KEY")
         host_url = payment.origin_url or str(request.base_url).rstrip("/")
         webhook_url = f"{host_url}/api/webhook/stripe"
         
-        stripe_checkout = StripeCheckout(api_key=api_key, webhook_url=webhook_url)
+        stripe_checkout = get_stripe_checkout(webhook_url)
         
         success_url = f"{host_url}/payment-success?session_id={{CHECKOUT_SESSION_ID}}"
         cancel_url = f"{host_url}/pos"
@@ -2467,41 +2880,51 @@ async def create_payment(payment: PaymentCreate, request: Request, current_user:
         )
     
     await db.payment_transactions.insert_one(payment_doc)
+    invalidate_metrics_cache()
     payment_doc.pop("_id", None)
     
     return PaymentResponse(**payment_doc)
 
-@api_router.get("/payments/status/{session_id}")
-async def get_payment_status(session_id: str, current_user: dict = Depends(get_current_user)):
-    from emergentintegrations.payments.stripe.checkout import StripeCheckout
+async def complete_stripe_payment(session_id: str, background_tasks: BackgroundTasks):
+    """Mark a Stripe payment completed and award loyalty points exactly once.
+    
+    Polling and the webhook can race; only the call that flips the
+    transaction to completed goes on to update the order.
+    """
+    payment = await db.payment_transactions.find_one_and_update(
+        {"stripe_session_id": session_id, "status": {"$ne": PaymentStatus.COMPLETED.value}},
+        {"$set": {"status": PaymentStatus.COMPLETED.value}},
+        projection={"_id": 0, "order_id": 1, "amount": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if not payment:
+        return
     
-    api_key = os.environ.get("STRIPE_API_KEY")
-    stripe_checkout = StripeCheckout(api_key=api_key, webhook_url="")
+    order = await db.orders.find_one_and_update(
+        {"id": payment["order_id"]},
+        {"$set": {
+            "payment_status": PaymentStatus.COMPLETED.value,
+            "payment_method": PaymentMethod.CARD.value
+        }},
+        projection={"_id": 0, "customer_id": 1, "order_number": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    invalidate_metrics_cache()
+    if order:
+        # Award loyalty points after the response has been sent
+        background_tasks.add_task(
+            award_loyalty_points,
+            order["customer_id"], payment["order_id"], float(payment["amount"]), order.get("order_number", "")
+        )
+
+@api_router.get("/payments/status/{session_id}")
+async def get_payment_status(session_id: str, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
+    stripe_checkout = get_stripe_checkout()
     
     status = await stripe_checkout.get_checkout_status(session_id)
     
     if status.payment_status == "paid":
-        payment = await db.payment_transactions.find_one({"stripe_session_id": session_id}, {"_id": 0})
-        if payment and payment["status"] != PaymentStatus.COMPLETED.value:
-            now = datetime.now(timezone.utc).isoformat()
-            
-            await db.payment_transactions.update_one(
-                {"stripe_session_id": session_id},
-                {"$set": {"status": PaymentStatus.COMPLETED.value}}
-            )
-            
-            await db.orders.update_one(
-                {"id": payment["order_id"]},
-                {"$set": {
-                    "payment_status": PaymentStatus.COMPLETED.value,
-                    "payment_method": PaymentMethod.CARD.value
-                }}
-            )
-            
-            order = await db.orders.find_one({"id": payment["order_id"]}, {"_id": 0})
-            if order:
-                # Award loyalty points
-                await award_loyalty_points(order["customer_id"], payment["order_id"], float(payment["amount"]), order.get("order_number", ""))
+        await complete_stripe_payment(session_id, background_tasks)
     
     return {
         "status": status.status,
@@ -2511,11 +2934,8 @@ async def get_payment_status(session_id: str, current_user: dict = Depends(get_c
     }
 
 @api_router.post("/webhook/stripe")
-async def stripe_webhook(request: Request):
-    from emergentintegrations.payments.stripe.checkout import StripeCheckout
-    
-    api_key = os.environ.get("STRIPE_API_KEY")
-    stripe_checkout = StripeCheckout(api_key=api_key, webhook_url="")
+async def stripe_webhook(request: Request, background_tasks: BackgroundTasks):
+    stripe_checkout = get_stripe_checkout()
     
     body = await request.body()
     signature = request.headers.get("Stripe-Signature", "")
@@ -2524,24 +2944,7 @@ async def stripe_webhook(request: Request):
         webhook_response = await stripe_checkout.handle_webhook(body, signature)
         
         if webhook_response.payment_status == "paid":
-            session_id = webhook_response.session_id
-            payment = await db.payment_transactions.find_one({"stripe_session_id": session_id}, {"_id": 0})
-            
-            if payment and payment["status"] != PaymentStatus.COMPLETED.value:
-                now = datetime.now(timezone.utc).isoformat()
-                
-                await db.payment_transactions.update_one(
-                    {"stripe_session_id": session_id},
-                    {"$set": {"status": PaymentStatus.COMPLETED.value}}
-                )
-                
-                await db.orders.update_one(
-                    {"id": payment["order_id"]},
-                    {"$set": {
-                        "payment_status": PaymentStatus.COMPLETED.value,
-                        "payment_method": PaymentMethod.CARD.value
-                    }}
-                )
+            await complete_stripe_payment(webhook_response.session_id, background_tasks)
         
         return {"received": True}
     except Exception as e:
@@ -2551,12 +2954,16 @@ async def stripe_webhook(request: Request):
 
 # ======================== METRICS ROUTES ========================
 
-@api_router.get("/metrics/overview")
+@api_router.get("/metrics/overview", dependencies=[Depends(metrics_cache_control)])
 async def get_metrics_overview(
     period: str = "month",  # day, week, month, year
     current_user: dict = Depends(get_current_user)
 ):
     """Get key metrics with comparison to previous period"""
+    cache_key = ("overview", period)
+    if cache_key in _metrics_cache:
+        return _metrics_cache[cache_key]
+    
     now = datetime.now(timezone.utc)
     
     # Define periods
@@ -2578,42 +2985,60 @@ async def get_metrics_overview(
     previous_start_str = previous_start.isoformat()
     previous_end_str = current_start.isoformat()
     
-    # Current period orders
-    current_orders = await db.orders.find({
-        "timestamps.created_at": {"$gte": current_start_str},
-        "payment_status": "completed"
-    }, {"_id": 0}).to_list(10000)
+    # Revenue and order counts for both periods, reduced server-side
+    pipeline = [
+        {"$match": {
+            "payment_status": "completed",
+            "timestamps.created_at": {"$gte": previous_start_str}
+        }},
+        {"$facet": {
+            "current": [
+                {"$match": {"timestamps.created_at": {"$gte": current_start_str}}},
+                {"$group": {"_id": None, "revenue": {"$sum": "$total"}, "orders": {"$sum": 1}}}
+            ],
+            "previous": [
+                {"$match": {"timestamps.created_at": {"$gte": previous_start_str, "$lt": previous_end_str}}},
+                {"$group": {"_id": None, "revenue": {"$sum": "$total"}, "orders": {"$sum": 1}}}
+            ]
+        }}
+    ]
     
-    # Previous period orders
-    previous_orders = await db.orders.find({
-        "timestamps.created_at": {"$gte": previous_start_str, "$lt": previous_end_str},
-        "payment_status": "completed"
-    }, {"_id": 0}).to_list(10000)
+    # New customers for both periods from one scan of the created_at range
+    customers_pipeline = [
+        {"$match": {"created_at": {"$gte": previous_start_str}}},
+        {"$group": {
+            "_id": None,
+            "current": {"$sum": {"$cond": [{"$gte": ["$created_at", current_start_str]}, 1, 0]}},
+            "previous": {"$sum": {"$cond": [{"$lt": ["$created_at", previous_end_str]}, 1, 0]}}
+        }}
+    ]
+    
+    # Order totals and new customer counts are independent, so run them concurrently
+    order_totals, customer_totals = await asyncio.gather(
+        db.orders.aggregate(pipeline).to_list(1),
+        db.customers.aggregate(customers_pipeline).to_list(1)
+    )
+    current_totals = order_totals[0]["current"][0] if order_totals[0]["current"] else {}
+    previous_totals = order_totals[0]["previous"][0] if order_totals[0]["previous"] else {}
+    current_new_customers = customer_totals[0]["current"] if customer_totals else 0
+    previous_new_customers = customer_totals[0]["previous"] if customer_totals else 0
     
     # Calculate metrics
-    current_revenue = sum(o["total"] for o in current_orders)
-    previous_revenue = sum(o["total"] for o in previous_orders)
+    current_revenue = current_totals.get("revenue", 0)
+    previous_revenue = previous_totals.get("revenue", 0)
     
-    current_count = len(current_orders)
-    previous_count = len(previous_orders)
+    current_count = current_totals.get("orders", 0)
+    previous_count = previous_totals.get("orders", 0)
     
     current_avg = current_revenue / current_count if current_count > 0 else 0
     previous_avg = previous_revenue / previous_count if previous_count > 0 else 0
     
-    # New customers
-    current_new_customers = await db.customers.count_documents({
-        "created_at": {"$gte": current_start_str}
-    })
-    previous_new_customers = await db.customers.count_documents({
-        "created_at": {"$gte": previous_start_str, "$lt": previous_end_str}
-    })
-    
     def calc_change(current, previous):
         if previous == 0:
             return 100 if current > 0 else 0
         return round(((current - previous) / previous) * 100, 1)
     
-    return {
+    result = {
         "period": period,
         "current_period": {
             "start": current_start_str,
@@ -2636,8 +3061,10 @@ async def get_metrics_overview(
             "new_customers": calc_change(current_new_customers, previous_new_customers)
         }
     }
+    _metrics_cache[cache_key] = result
+    return result
 
-@api_router.get("/metrics/revenue")
+@api_router.get("/metrics/revenue", dependencies=[Depends(metrics_cache_control)])
 async def get_revenue_metrics(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
@@ -2645,6 +3072,10 @@ async def get_revenue_metrics(
     current_user: dict = Depends(get_current_user)
 ):
     """Get revenue breakdown over time"""
+    cache_key = ("revenue", date_from, date_to, group_by)
+    if cache_key in _metrics_cache:
+        return _metrics_cache[cache_key]
+    
     query = {"payment_status": "completed"}
     
     if date_from:
@@ -2655,45 +3086,49 @@ async def get_revenue_metrics(
         else:
             query["timestamps.created_at"] = {"$lte": date_to}
     
-    orders = await db.orders.find(query, {"_id": 0}).to_list(10000)
-    
-    from collections import defaultdict
-    revenue_data = defaultdict(lambda: {"revenue": 0, "orders": 0, "items": 0})
-    
-    for order in orders:
-        created_at = order.get("timestamps", {}).get("created_at", "")
-        if not created_at:
-            continue
-        
-        if group_by == "day":
-            key = created_at[:10]
-        elif group_by == "week":
-            from datetime import datetime as dt
-            date = dt.fromisoformat(created_at.replace("Z", "+00:00"))
-            key = f"{date.year}-W{date.isocalendar()[1]:02d}"
-        else:  # month
-            key = created_at[:7]
-        
-        revenue_data[key]["revenue"] += order["total"]
-        revenue_data[key]["orders"] += 1
-        revenue_data[key]["items"] += sum(i["quantity"] for i in order.get("items", []))
-    
-    result = [{"period": k, **v} for k, v in sorted(revenue_data.items())]
+    # Bucket keys: YYYY-MM-DD, YYYY-Www, YYYY-MM. The week key pairs the calendar
+    # year with the ISO week, as the labels dashboards already store always have
+    if group_by == "day":
+        period_key = {"$substrCP": ["$timestamps.created_at", 0, 10]}
+    elif group_by == "week":
+        period_key = {"$dateToString": {"format": "%Y-W%V", "date": {"$toDate": "$timestamps.created_at"}}}
+    else:  # month
+        period_key = {"$substrCP": ["$timestamps.created_at", 0, 7]}
+    
+    pipeline = [
+        {"$match": query},
+        {"$match": {"timestamps.created_at": {"$gt": ""}}},
+        {"$group": {
+            "_id": period_key,
+            "revenue": {"$sum": "$total"},
+            "orders": {"$sum": 1},
+            "items": {"$sum": {"$sum": "$items.quantity"}}
+        }},
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "period": "$_id", "revenue": 1, "orders": 1, "items": 1}}
+    ]
+    data = await db.orders.aggregate(pipeline).to_list(None)
     
-    return {
+    result = {
         "group_by": group_by,
-        "data": result,
-        "total_revenue": sum(d["revenue"] for d in result),
-        "total_orders": sum(d["orders"] for d in result)
+        "data": data,
+        "total_revenue": sum(d["revenue"] for d in data),
+        "total_orders": sum(d["orders"] for d in data)
     }
+    _metrics_cache[cache_key] = result
+    return result
 
-@api_router.get("/metrics/items")
+@api_router.get("/metrics/items", dependencies=[Depends(metrics_cache_control)])
 async def get_item_metrics(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
     """Get item/service performance metrics"""
+    cache_key = ("items", date_from, date_to)
+    if cache_key in _metrics_cache:
+        return _metrics_cache[cache_key]
+    
     query = {"payment_status": "completed"}
     
     if date_from:
@@ -2704,41 +3139,58 @@ async def get_item_metrics(
         else:
             query["timestamps.created_at"] = {"$lte": date_to}
     
-    orders = await db.orders.find(query, {"_id": 0}).to_list(10000)
-    
-    item_stats = {}
-    for order in orders:
-        for item in order.get("items", []):
-            name = item["item_name"]
-            if name not in item_stats:
-                item_stats[name] = {
-                    "name": name,
-                    "quantity": 0,
-                    "revenue": 0,
-                    "orders": 0,
-                    "by_service_type": {"regular": 0, "express": 0, "delicate": 0}
-                }
-            item_stats[name]["quantity"] += item["quantity"]
-            item_stats[name]["revenue"] += item["total_price"] - item.get("discount_applied", 0)
-            item_stats[name]["orders"] += 1
-            service_type = item.get("service_type", "regular")
-            item_stats[name]["by_service_type"][service_type] += item["quantity"]
+    def quantity_for_service(service_type: str) -> dict:
+        return {"$sum": {"$cond": [
+            {"$eq": [{"$ifNull": ["$items.service_type", "regular"]}, service_type]},
+            "$items.quantity",
+            0
+        ]}}
+    
+    pipeline = [
+        {"$match": query},
+        {"$unwind": "$items"},
+        {"$group": {
+            "_id": "$items.item_name",
+            "quantity": {"$sum": "$items.quantity"},
+            "revenue": {"$sum": {"$subtract": ["$items.total_price", {"$ifNull": ["$items.discount_applied", 0]}]}},
+            "orders": {"$sum": 1},
+            "regular": quantity_for_service("regular"),
+            "express": quantity_for_service("express"),
+            "delicate": quantity_for_service("delicate")
+        }},
+        {"$sort": {"revenue": -1}}
+    ]
     
-    sorted_items = sorted(item_stats.values(), key=lambda x: x["revenue"], reverse=True)
+    sorted_items = [
+        {
+            "name": s["_id"],
+            "quantity": s["quantity"],
+            "revenue": s["revenue"],
+            "orders": s["orders"],
+            "by_service_type": {"regular": s["regular"], "express": s["express"], "delicate": s["delicate"]}
+        }
+        async for s in db.orders.aggregate(pipeline)
+    ]
     
-    return {
+    result = {
         "items": sorted_items,
         "total_items": sum(i["quantity"] for i in sorted_items),
         "total_revenue": sum(i["revenue"] for i in sorted_items)
     }
+    _metrics_cache[cache_key] = result
+    return result
 
-@api_router.get("/metrics/customers")
+@api_router.get("/metrics/customers", dependencies=[Depends(metrics_cache_control)])
 async def get_customer_metrics(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
     """Get customer analytics"""
+    cache_key = ("customers", date_from, date_to)
+    if cache_key in _metrics_cache:
+        return _metrics_cache[cache_key]
+    
     query = {"payment_status": "completed"}
     
     if date_from:
@@ -2749,47 +3201,61 @@ async def get_customer_metrics(
         else:
             query["timestamps.created_at"] = {"$lte": date_to}
     
-    orders = await db.orders.find(query, {"_id": 0}).to_list(10000)
-    
-    customer_stats = {}
-    for order in orders:
-        cid = order["customer_id"]
-        if cid not in customer_stats:
-            customer_stats[cid] = {
-                "customer_id": cid,
-                "customer_name": order["customer_name"],
-                "customer_type": order.get("customer_type", "retail"),
-                "orders": 0,
-                "revenue": 0
-            }
-        customer_stats[cid]["orders"] += 1
-        customer_stats[cid]["revenue"] += order["total"]
-    
-    sorted_customers = sorted(customer_stats.values(), key=lambda x: x["revenue"], reverse=True)
+    pipeline = [
+        {"$match": query},
+        {"$group": {
+            "_id": "$customer_id",
+            "customer_name": {"$first": "$customer_name"},
+            "customer_type": {"$first": {"$ifNull": ["$customer_type", "retail"]}},
+            "orders": {"$sum": 1},
+            "revenue": {"$sum": "$total"}
+        }},
+        {"$facet": {
+            "top": [
+                {"$sort": {"revenue": -1}},
+                {"$limit": 20},
+                {"$project": {"_id": 0, "customer_id": "$_id", "customer_name": 1, "customer_type": 1, "orders": 1, "revenue": 1}}
+            ],
+            "by_type": [
+                {"$group": {"_id": "$customer_type", "count": {"$sum": 1}, "revenue": {"$sum": "$revenue"}}}
+            ],
+            "totals": [
+                {"$group": {"_id": None, "total_customers": {"$sum": 1}, "total_revenue": {"$sum": "$revenue"}}}
+            ]
+        }}
+    ]
+    facets = (await db.orders.aggregate(pipeline).to_list(1))[0]
     
     # Customer type breakdown
-    retail_count = sum(1 for c in sorted_customers if c["customer_type"] == "retail")
-    business_count = sum(1 for c in sorted_customers if c["customer_type"] == "business")
-    retail_revenue = sum(c["revenue"] for c in sorted_customers if c["customer_type"] == "retail")
-    business_revenue = sum(c["revenue"] for c in sorted_customers if c["customer_type"] == "business")
+    by_type = {t["_id"]: t for t in facets["by_type"]}
+    totals = facets["totals"][0] if facets["totals"] else {"total_customers": 0, "total_revenue": 0}
     
-    return {
-        "top_customers": sorted_customers[:20],
-        "total_customers": len(sorted_customers),
+    result = {
+        "top_customers": facets["top"],
+        "total_customers": totals["total_customers"],
         "by_type": {
-            "retail": {"count": retail_count, "revenue": retail_revenue},
-            "business": {"count": business_count, "revenue": business_revenue}
+            customer_type: {
+                "count": by_type.get(customer_type, {}).get("count", 0),
+                "revenue": by_type.get(customer_type, {}).get("revenue", 0)
+            }
+            for customer_type in ("retail", "business")
         },
-        "average_customer_value": sum(c["revenue"] for c in sorted_customers) / len(sorted_customers) if sorted_customers else 0
+        "average_customer_value": totals["total_revenue"] / totals["total_customers"] if totals["total_customers"] else 0
     }
+    _metrics_cache[cache_key] = result
+    return result
 
-@api_router.get("/metrics/payments")
+@api_router.get("/metrics/payments", dependencies=[Depends(metrics_cache_control)])
 async def get_payment_metrics(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
     """Get payment method breakdown"""
+    cache_key = ("payments", date_from, date_to)
+    if cache_key in _metrics_cache:
+        return _metrics_cache[cache_key]
+    
     query = {"payment_status": "completed"}
     
     if date_from:
@@ -2800,20 +3266,26 @@ async def get_payment_metrics(
         else:
             query["timestamps.created_at"] = {"$lte": date_to}
     
-    orders = await db.orders.find(query, {"_id": 0}).to_list(10000)
-    
-    payment_stats = {}
-    for order in orders:
-        method = order.get("payment_method", "unknown")
-        if method not in payment_stats:
-            payment_stats[method] = {"method": method, "count": 0, "revenue": 0}
-        payment_stats[method]["count"] += 1
-        payment_stats[method]["revenue"] += order["total"]
+    pipeline = [
+        {"$match": query},
+        {"$group": {
+            "_id": {"$ifNull": ["$payment_method", "unknown"]},
+            "count": {"$sum": 1},
+            "revenue": {"$sum": "$total"}
+        }},
+        {"$project": {"_id": 0, "method": "$_id", "count": 1, "revenue": 1}}
+    ]
+    by_method = await db.orders.aggregate(pipeline).to_list(None)
     
-    return {
-        "by_method": list(payment_stats.values()),
-        "total_revenue": sum(p["revenue"] for p in payment_stats.values())
+    result = {
+        "by_method": by_method,
+        "total_revenue": sum(p["revenue"] for p in by_method)
     }
+    _metrics_cache[cache_key] = result
+    return result
+
+# Rows fetched per cursor batch and buffered per chunk written to the export stream
+CSV_EXPORT_CHUNK_ROWS = 1000
 
 @api_router.get("/metrics/export/{report_type}")
 async def export_metrics(
@@ -2832,32 +3304,50 @@ async def export_metrics(
         else:
             query["timestamps.created_at"] = {"$lte": date_to}
     
-    output = io.StringIO()
-    writer = csv.writer(output)
+    header = None
+    cursor = None
+    to_row = None
     
     if report_type == "orders":
-        writer.writerow(["Order Number", "Date", "Customer", "Items", "Subtotal", "Tax", "Discount", "Total", "Status", "Payment"])
-        orders = await db.orders.find(query, {"_id": 0}).to_list(10000)
-        for o in orders:
-            writer.writerow([
-                o["order_number"],
-                o.get("timestamps", {}).get("created_at", "")[:10],
-                o["customer_name"],
-                sum(i["quantity"] for i in o.get("items", [])),
-                o["subtotal"],
-                o["tax"],
-                o.get("customer_discount_amount", 0) + o.get("volume_discount_amount", 0) + o.get("manual_discount", 0),
-                o["total"],
-                o["status"],
-                o.get("payment_method", "")
-            ])
+        header = ["Order Number", "Date", "Customer", "Items", "Subtotal", "Tax", "Discount", "Total", "Status", "Payment"]
+        cursor = db.orders.aggregate([
+            {"$match": query},
+            # Emit ready-made CSV columns so rows need no per-field work in Python
+            {"$project": {
+                "_id": 0,
+                "order_number": 1,
+                "date": {"$substrCP": [{"$ifNull": ["$timestamps.created_at", ""]}, 0, 10]},
+                "customer_name": 1,
+                "quantity": {"$sum": "$items.quantity"},
+                "subtotal": 1,
+                "tax": 1,
+                "discount": {"$add": [
+                    {"$ifNull": ["$customer_discount_amount", 0]},
+                    {"$ifNull": ["$volume_discount_amount", 0]},
+                    {"$ifNull": ["$manual_discount", 0]}
+                ]},
+                "total": 1,
+                "status": 1,
+                "payment_method": {"$ifNull": ["$payment_method", ""]}
+            }}
+        ], batchSize=CSV_EXPORT_CHUNK_ROWS)
+        
+        def to_row(o):
+            return [
+                o["order_number"], o["date"], o["customer_name"], o["quantity"], o["subtotal"],
+                o["tax"], o["discount"], o["total"], o["status"], o["payment_method"]
+            ]
     
     elif report_type == "customers":
-        writer.writerow(["Name", "Type", "Phone", "Email", "Total Orders", "Total Spent", "Avg Order", "Discount %", "Status"])
-        customers = await db.customers.find({}, {"_id": 0}).to_list(10000)
-        for c in customers:
+        header = ["Name", "Type", "Phone", "Email", "Total Orders", "Total Spent", "Avg Order", "Discount %", "Status"]
+        cursor = db.customers.find({}, {
+            "_id": 0, "name": 1, "customer_type": 1, "phone": 1, "email": 1, "total_orders": 1,
+            "total_spent": 1, "average_order_value": 1, "discount_percent": 1, "is_blacklisted": 1
+        }).batch_size(CSV_EXPORT_CHUNK_ROWS)
+        
+        def to_row(c):
             status = "Blacklisted" if c.get("is_blacklisted") else "Active"
-            writer.writerow([
+            return [
                 c["name"],
                 c.get("customer_type", "retail"),
                 c["phone"],
@@ -2867,33 +3357,45 @@ async def export_metrics(
                 c.get("average_order_value", 0),
                 c.get("discount_percent", 0),
                 status
-            ])
+            ]
     
     elif report_type == "items":
         query["payment_status"] = "completed"
-        orders = await db.orders.find(query, {"_id": 0}).to_list(10000)
-        
-        item_stats = {}
-        for order in orders:
-            for item in order.get("items", []):
-                name = item["item_name"]
-                if name not in item_stats:
-                    item_stats[name] = {"quantity": 0, "revenue": 0}
-                item_stats[name]["quantity"] += item["quantity"]
-                item_stats[name]["revenue"] += item["total_price"]
+        header = ["Item Name", "Quantity Sold", "Revenue"]
+        cursor = db.orders.aggregate([
+            {"$match": query},
+            {"$unwind": "$items"},
+            {"$group": {"_id": "$items.item_name", "quantity": {"$sum": "$items.quantity"}, "revenue": {"$sum": "$items.total_price"}}},
+            {"$sort": {"revenue": -1}}
+        ], batchSize=CSV_EXPORT_CHUNK_ROWS)
         
-        writer.writerow(["Item Name", "Quantity Sold", "Revenue"])
-        for name, stats in sorted(item_stats.items(), key=lambda x: x[1]["revenue"], reverse=True):
-            writer.writerow([name, stats["quantity"], stats["revenue"]])
+        def to_row(i):
+            return [i["_id"], i["quantity"], i["revenue"]]
+    
+    async def generate_csv():
+        """Yield the CSV in encoded chunks of CSV_EXPORT_CHUNK_ROWS rows"""
+        if header is None:
+            return
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(header)
+        rows = 0
+        async for doc in cursor:
+            writer.writerow(to_row(doc))
+            rows += 1
+            if rows == CSV_EXPORT_CHUNK_ROWS:
+                yield output.getvalue().encode("utf-8")
+                output.seek(0)
+                output.truncate(0)
+                rows = 0
+        yield output.getvalue().encode("utf-8")
     
-    output.seek(0)
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
+        generate_csv(),
+        media_type="text/csv; charset=utf-8",
         headers={"Content-Disposition": f"attachment; filename={report_type}_report.csv"}
     )
 
-
 # ======================== REPORTS ROUTES (Legacy) ========================
 
 @api_router.get("/reports/sales")
@@ -2911,38 +3413,44 @@ async def get_sales_report(
         if date_to:
             query["timestamps.created_at"]["$lte"] = date_to
     
-    orders = await db.orders.find(query, {"_id": 0}).to_list(10000)
+    pipeline = [
+        {"$match": query},
+        {"$facet": {
+            "totals": [
+                {"$group": {"_id": None, "total_sales": {"$sum": "$total"}, "total_orders": {"$sum": 1}}}
+            ],
+            "payments": [
+                {"$group": {"_id": {"$ifNull": ["$payment_method", "cash"]}, "total": {"$sum": "$total"}}}
+            ],
+            "top_items": [
+                {"$unwind": "$items"},
+                {"$group": {"_id": "$items.item_name", "quantity": {"$sum": "$items.quantity"}, "revenue": {"$sum": "$items.total_price"}}},
+                {"$sort": {"revenue": -1}},
+                {"$limit": 10},
+                {"$project": {"_id": 0, "name": "$_id", "quantity": 1, "revenue": 1}}
+            ],
+            "daily_sales": [
+                {"$match": {"timestamps.created_at": {"$gt": ""}}},
+                {"$group": {"_id": {"$substrCP": ["$timestamps.created_at", 0, 10]}, "sales": {"$sum": "$total"}, "orders": {"$sum": 1}}},
+                {"$sort": {"_id": -1}},
+                {"$limit": 30},
+                {"$project": {"_id": 0, "date": "$_id", "sales": 1, "orders": 1}}
+            ]
+        }}
+    ]
+    result = (await db.orders.aggregate(pipeline).to_list(1))[0]
     
-    total_sales = sum(o["total"] for o in orders)
-    total_orders = len(orders)
+    totals = result["totals"][0] if result["totals"] else {"total_sales": 0, "total_orders": 0}
+    total_sales = totals["total_sales"]
+    total_orders = totals["total_orders"]
     avg_order_value = total_sales / total_orders if total_orders > 0 else 0
     
     payment_breakdown = {"cash": 0, "card": 0, "bank_transfer": 0, "pay_on_collection": 0, "invoice": 0}
-    for o in orders:
-        method = o.get("payment_method", "cash")
-        payment_breakdown[method] = payment_breakdown.get(method, 0) + o["total"]
-    
-    item_counts = {}
-    for o in orders:
-        for item in o.get("items", []):
-            name = item["item_name"]
-            if name not in item_counts:
-                item_counts[name] = {"name": name, "quantity": 0, "revenue": 0}
-            item_counts[name]["quantity"] += item["quantity"]
-            item_counts[name]["revenue"] += item["total_price"]
-    
-    top_items = sorted(item_counts.values(), key=lambda x: x["revenue"], reverse=True)[:10]
-    
-    daily_sales = {}
-    for o in orders:
-        date = o.get("timestamps", {}).get("created_at", "")[:10]
-        if date:
-            if date not in daily_sales:
-                daily_sales[date] = {"date": date, "sales": 0, "orders": 0}
-            daily_sales[date]["sales"] += o["total"]
-            daily_sales[date]["orders"] += 1
-    
-    daily_sales_list = sorted(daily_sales.values(), key=lambda x: x["date"])[-30:]
+    for p in result["payments"]:
+        payment_breakdown[p["_id"]] = p["total"]
+    
+    top_items = result["top_items"]
+    daily_sales_list = result["daily_sales"][::-1]
     
     return {
         "total_sales": total_sales,
@@ -2957,32 +3465,55 @@ async def get_sales_report(
 async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     
-    today_orders = await db.orders.find(
-        {"timestamps.created_at": {"$gte": today}},
-        {"_id": 0}
-    ).to_list(1000)
-    
-    today_revenue = sum(o["total"] for o in today_orders if o["payment_status"] == "completed")
-    today_order_count = len(today_orders)
-    
-    cleaning_orders = await db.orders.count_documents({"status": "cleaning"})
-    ready_orders = await db.orders.count_documents({"status": "ready"})
+    today_pipeline = [
+        {"$match": {"timestamps.created_at": {"$gte": today}}},
+        {"$group": {
+            "_id": None,
+            "revenue": {"$sum": {"$cond": [{"$eq": ["$payment_status", "completed"]}, "$total", 0]}},
+            "count": {"$sum": 1}
+        }}
+    ]
     
-    delivery_orders = await db.orders.count_documents({
+    open_delivery_match = {
         "delivery_info": {"$ne": None},
         "status": {"$nin": ["delivered", "collected", "cancelled"]}
-    })
+    }
+    status_pipeline = [
+        # Narrow to the orders either facet counts before fanning out, so the
+        # status index is used instead of feeding every order to both branches
+        {"$match": {"$or": [{"status": {"$in": ["cleaning", "ready"]}}, open_delivery_match]}},
+        {"$project": {"_id": 0, "status": 1, "delivery_info": 1}},
+        {"$facet": {
+            "by_status": [
+                {"$match": {"status": {"$in": ["cleaning", "ready"]}}},
+                {"$group": {"_id": "$status", "n": {"$sum": 1}}}
+            ],
+            "delivery": [
+                {"$match": open_delivery_match},
+                {"$count": "n"}
+            ]
+        }}
+    ]
     
-    total_customers = await db.customers.count_documents({})
+    # Every dashboard figure is independent, so fetch them all concurrently
+    today_totals, status_facets, total_customers, recent_orders = await asyncio.gather(
+        db.orders.aggregate(today_pipeline).to_list(1),
+        db.orders.aggregate(status_pipeline).to_list(1),
+        db.customers.count_documents({}),
+        db.orders.find({}, {"_id": 0}).sort("timestamps.created_at", -1).to_list(5)
+    )
     
-    recent_orders = await db.orders.find({}, {"_id": 0}).sort("timestamps.created_at", -1).to_list(5)
+    today_revenue = today_totals[0]["revenue"] if today_totals else 0
+    today_order_count = today_totals[0]["count"] if today_totals else 0
+    status_counts = {s["_id"]: s["n"] for s in status_facets[0]["by_status"]}
+    delivery = status_facets[0]["delivery"]
     
     return {
         "today_revenue": today_revenue,
         "today_orders": today_order_count,
-        "cleaning_orders": cleaning_orders,
-        "ready_orders": ready_orders,
-        "delivery_orders": delivery_orders,
+        "cleaning_orders": status_counts.get("cleaning", 0),
+        "ready_orders": status_counts.get("ready", 0),
+        "delivery_orders": delivery[0]["n"] if delivery else 0,
         "total_customers": total_customers,
         "recent_orders": recent_orders
     }
@@ -2992,7 +3523,12 @@ async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
 
 @api_router.post("/seed")
 async def seed_data():
-    items_count = await db.items.count_documents({})
+    # Precondition checks are independent, so run them concurrently
+    items_count, admin_exists, settings_exist = await asyncio.gather(
+        db.items.count_documents({}),
+        db.users.find_one({"email": "admin@dryclean.com"}, {"_id": 1}),
+        db.settings.find_one({"id": "default"}, {"_id": 1})
+    )
     if items_count > 0:
         return {"message": "Data already seeded"}
     
@@ -3012,16 +3548,14 @@ async def seed_data():
     
     category_ids = {}
     for cat in default_categories:
-        cat_id = str(uuid.uuid4())
+        cat_id = new_id()
         category_ids[cat["name"]] = cat_id
         cat["id"] = cat_id
         cat["is_active"] = True
         cat["created_at"] = now
     
-    await db.categories.insert_many(default_categories)
-    
     # Parent item for Men's Suit
-    mens_suit_id = str(uuid.uuid4())
+    mens_suit_id = new_id()
     
     default_items = [
         # Men's Suits - Parent
@@ -3146,34 +3680,45 @@ async def seed_data():
     
     for item in default_items:
         if "id" not in item:
-            item["id"] = str(uuid.uuid4())
+            item["id"] = new_id()
         item["is_active"] = True
         item["created_at"] = now
     
-    await db.items.insert_many(default_items)
+    # Seed the denormalized counters maintained by the item routes
+    for item in default_items:
+        item["children_count"] = sum(1 for child in default_items if child.get("parent_id") == item["id"])
+    for cat in default_categories:
+        cat["items_count"] = sum(1 for item in default_items if item["category_id"] == cat["id"])
+    
+    # Seed documents are independent, so let the server apply them unordered
+    writes = [
+        db.categories.insert_many(default_categories, ordered=False),
+        db.items.insert_many(default_items, ordered=False)
+    ]
     
     # Create default admin
-    admin_exists = await db.users.find_one({"email": "admin@dryclean.com"})
     if not admin_exists:
         admin_doc = {
-            "id": str(uuid.uuid4()),
+            "id": new_id(),
             "email": "admin@dryclean.com",
             "name": "Admin User",
             "role": "admin",
             "password_hash": hash_password("admin123"),
             "created_at": now
         }
-        await db.users.insert_one(admin_doc)
+        writes.append(db.users.insert_one(admin_doc))
     
     # Create default settings
-    settings_exist = await db.settings.find_one({"id": "default"})
     if not settings_exist:
         default_settings = {
             "id": "default",
             "settings": BusinessSettings().model_dump(),
             "updated_at": now
         }
-        await db.settings.insert_one(default_settings)
+        writes.append(db.settings.insert_one(default_settings))
+    
+    await asyncio.gather(*writes)
+    invalidate_reference_cache()
     
     return {"message": "Data seeded successfully", "items_created": len(default_items), "categories_created": len(default_categories)}
 
@@ -3192,14 +3737,81 @@ async def health():
 # Include router and middleware
 app.include_router(api_router)
 
+@app.exception_handler(WaitQueueTimeoutError)
+@app.exception_handler(ServerSelectionTimeoutError)
+async def database_unavailable_handler(request: Request, exc: Exception):
+    """Answer 503 when no database connection is available so clients can retry"""
+    logger.warning(f"Database unavailable for {request.method} {request.url.path}: {exc}")
+    return ORJSONResponse(status_code=503, content={"detail": "Database busy, please retry"}, headers={"Retry-After": "1"})
+
+# Reference data gets a content ETag so unchanged responses revalidate as 304 Not Modified
+ETAG_PATH_PREFIXES = ("/api/categories", "/api/items", "/api/item-categories", "/api/drivers")
+
+@app.middleware("http")
+async def etag_middleware(request: Request, call_next):
+    response = await call_next(request)
+    if request.method != "GET" or response.status_code != 200 or not request.url.path.startswith(ETAG_PATH_PREFIXES):
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = dict(response.headers)
+    headers["etag"] = etag
+    headers["cache-control"] = "private, no-cache"
+    
+    if request.headers.get("if-none-match") == etag:
+        headers.pop("content-length", None)
+        headers.pop("content-type", None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, status_code=response.status_code, headers=headers)
+
+CORS_ORIGINS = [origin.strip() for origin in os.environ.get('CORS_ORIGINS', '*').split(',') if origin.strip()]
+# e.g. r"https?://(localhost|127\.0\.0\.1)(:\d+)?" for local development
+CORS_ORIGIN_REGEX = os.environ.get('CORS_ORIGIN_REGEX') or None
+
 app.add_middleware(
     CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+    # Browsers reject credentialed responses for a wildcard origin; auth uses bearer tokens anyway
+    allow_credentials="*" not in CORS_ORIGINS,
+    allow_origins=CORS_ORIGINS,
+    allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers cache preflight responses for a day
+    max_age=86400,
 )
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+async def ensure_indexes():
+    """Create the indexes backing the common order, category, item, metrics and payment queries"""
+    await db.orders.create_index([("customer_id", 1), ("status", 1), ("timestamps.created_at", -1)])
+    await db.orders.create_index([("customer_id", 1), ("timestamps.created_at", -1)])
+    await db.orders.create_index([("status", 1), ("timestamps.created_at", -1)])
+    await db.orders.create_index([("status", 1), ("timestamps.ready_at", -1)])
+    await db.orders.create_index([("payment_status", 1), ("timestamps.created_at", 1)])
+    await db.orders.create_index([("timestamps.created_at", -1)])
+    await db.orders.create_index([("delivery_info.pickup_date", 1)], sparse=True)
+    await db.orders.create_index([("delivery_info.driver_id", 1)], sparse=True)
+    await db.categories.create_index([("is_active", 1), ("sort_order", 1)])
+    await db.items.create_index([("parent_id", 1), ("is_active", 1)])
+    await db.items.create_index([("created_at", 1)])
+    await db.customers.create_index([("created_at", 1)])
+    await db.customers.create_index([("customer_type", 1), ("created_at", 1)])
+    await db.customers.create_index(
+        [("name", "text"), ("phone", "text"), ("email", "text"), ("business_info.company_name", "text")],
+        name="customer_search"
+    )
+    # Cash/card payments have no Stripe session, so uniqueness only applies where one is set
+    await db.payment_transactions.create_index(
+        [("stripe_session_id", 1)],
+        unique=True,
+        partialFilterExpression={"stripe_session_id": {"$type": "string"}}
+    )
+
+async def backfill_item_counters():
+    """Initialise items_count/children_count on documents created before the counters existed"""
+    async for category in db.categories.find({"items_count": {"$exists": False}}, {"_id": 0, "id": 1}):
+        count = await db.items.count_documents({"category_id": category["id"]})
+        await db.categories.update_one({"id": category["id"], "items_count": {"$exists": False}}, {"$set": {"items_count": count}})
+    async for item in db.items.find({"children_count": {"$exists": False}}, {"_id": 0, "id": 1}):
+        count = await db.items.count_documents({"parent_id": item["id"]})
+        await db.items.update_one({"id": item["id"], "children_count": {"$exists": False}}, {"$set": {"children_count": count}})
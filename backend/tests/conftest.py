@@ -0,0 +1,99 @@
+"""
+Shared fixtures for the backend API tests
+
+With REACT_APP_BACKEND_URL set the tests run end-to-end against that server;
+without it they call the FastAPI app in-process through TestClient.
+"""
+
+import pytest
+import pytest_asyncio
+import httpx
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+
+class InProcessAsyncClient:
+    """Async facade over TestClient so concurrent requests still run on the app's own event loop"""
+    
+    def __init__(self, client):
+        self._client = client
+    
+    async def get(self, url, **kwargs):
+        return await asyncio.to_thread(self._client.get, url, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """HTTP/2 client, or the in-process TestClient, shared by every test"""
+    if not BASE_URL:
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        from fastapi.testclient import TestClient
+        from server import app
+        
+        # Entering the client runs the app lifespan once for the whole session
+        with TestClient(app) as client:
+            yield client
+        return
+    
+    # HTTP/2 is negotiated over TLS; plain http URLs fall back to HTTP/1.1 keep-alive
+    with httpx.Client(base_url=BASE_URL, http2=True, timeout=30) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(http_session):
+    """Log in once and share the admin auth headers"""
+    response = http_session.post(f"{BASE_URL}/api/auth/login", json={
+        "email": "admin@dryclean.com",
+        "password": "admin123"
+    })
+    assert response.status_code == 200, f"Login failed: {response.text}"
+    token = response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="session")
+def date_window():
+    """Last-30-days range shared by every metrics test, so repeated queries hit the metrics cache"""
+    now = datetime.now()
+    return {
+        "date_from": (now - timedelta(days=30)).strftime("%Y-%m-%d"),
+        "date_to": now.strftime("%Y-%m-%d")
+    }
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_server(request, http_session):
+    """Wait for the API to report healthy, then warm the login and database paths once"""
+    delay = 0.25
+    for _ in range(20):
+        try:
+            if http_session.get(f"{BASE_URL}/api/health", timeout=2).status_code == 200:
+                break
+        except httpx.TransportError:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, 2)
+    else:
+        pytest.exit(f"API at {BASE_URL or 'in-process app'} never became healthy", returncode=1)
+    
+    # Log in only once the server is up; the shared session login then warms auth and Mongo
+    auth_headers = request.getfixturevalue("auth_headers")
+    http_session.get(f"{BASE_URL}/api/auth/me", headers=auth_headers)
+
+
+@pytest_asyncio.fixture
+async def async_client(http_session):
+    """Async HTTP client for tests that fire independent requests concurrently"""
+    if not BASE_URL:
+        # Motor is bound to the TestClient's loop, so in-process requests must go through it
+        yield InProcessAsyncClient(http_session)
+        return
+    async with httpx.AsyncClient(base_url=BASE_URL, http2=True, timeout=30) as client:
+        yield client
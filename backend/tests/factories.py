@@ -0,0 +1,17 @@
+"""
+Request payloads shared by the backend API tests
+
+Plain dicts holding only the fields a test sets; everything else is left to the
+server's CustomerCreate/BusinessInfo defaults, so there is no second copy of the
+schema here to drift from server.py.
+"""
+
+
+def business_info(company_name, **fields):
+    """business_info block for a business customer"""
+    return {"company_name": company_name, **fields}
+
+
+def customer_payload(name="TEST_Customer", phone="555-TEST-000", **fields):
+    """JSON body for POST /api/customers"""
+    return {"name": name, "phone": phone, **fields}
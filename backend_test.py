@@ -1,85 +1,25 @@
 #!/usr/bin/env python3
 
-import requests
 import sys
 import json
-from datetime import datetime
 
-class DryCleanPOSAPITester:
+from _api_tester import ApiTester
+
+class DryCleanPOSAPITester(ApiTester):
+    LOGIN_TEST_NAME = "Demo Login"
+
     def __init__(self, base_url="https://fresh-garments-1.preview.emergentagent.com"):
-        self.base_url = base_url
-        self.token = None
-        self.tests_run = 0
-        self.tests_passed = 0
-        self.test_results = []
+        super().__init__(base_url)
         self.created_customer_id = None
         self.created_order_id = None
 
-    def log_test(self, name, success, details=""):
-        """Log test result"""
-        self.tests_run += 1
-        if success:
-            self.tests_passed += 1
-            print(f"✅ {name}")
-        else:
-            print(f"❌ {name} - {details}")
-        
-        self.test_results.append({
-            "test": name,
-            "success": success,
-            "details": details
-        })
-
-    def run_test(self, name, method, endpoint, expected_status, data=None, headers=None):
-        """Run a single API test"""
-        url = f"{self.base_url}/api/{endpoint}"
-        test_headers = {'Content-Type': 'application/json'}
-        
-        if self.token:
-            test_headers['Authorization'] = f'Bearer {self.token}'
-        
-        if headers:
-            test_headers.update(headers)
-
-        try:
-            if method == 'GET':
-                response = requests.get(url, headers=test_headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=test_headers, timeout=10)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=test_headers, timeout=10)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=test_headers, timeout=10)
-
-            success = response.status_code == expected_status
-            details = f"Status: {response.status_code}"
-            
-            if not success:
-                details += f" (Expected {expected_status})"
-                try:
-                    error_data = response.json()
-                    details += f" - {error_data.get('detail', 'Unknown error')}"
-                except:
-                    details += f" - {response.text[:100]}"
-
-            self.log_test(name, success, details)
-            
-            if success:
-                try:
-                    return response.json()
-                except:
-                    return {}
-            return None
-
-        except Exception as e:
-            self.log_test(name, False, f"Exception: {str(e)}")
-            return None
-
     def test_health_check(self):
         """Test basic health endpoints"""
         print("\n🔍 Testing Health Endpoints...")
-        self.run_test("API Root", "GET", "", 200)
-        self.run_test("Health Check", "GET", "health", 200)
+        self.run_parallel([
+            ("API Root", "GET", "", 200),
+            ("Health Check", "GET", "health", 200),
+        ], parse_json=False)
 
     def test_seed_data(self):
         """Test data seeding"""
@@ -91,19 +31,11 @@ class DryCleanPOSAPITester:
         """Test authentication endpoints"""
         print("\n🔍 Testing Authentication...")
         
-        # Test login with demo credentials
-        login_data = {
-            "email": "admin@dryclean.com",
-            "password": "admin123"
-        }
-        
-        result = self.run_test("Demo Login", "POST", "auth/login", 200, login_data)
-        if result and 'access_token' in result:
-            self.token = result['access_token']
+        if self.login():
             print(f"   Token obtained: {self.token[:20]}...")
             
             # Test get current user
-            self.run_test("Get Current User", "GET", "auth/me", 200)
+            self.run_test("Get Current User", "GET", "auth/me", 200, parse_json=False)
             return True
         
         return False
@@ -117,13 +49,11 @@ class DryCleanPOSAPITester:
         if items:
             print(f"   Found {len(items)} items")
             
-            # Test get categories
-            self.run_test("Get Item Categories", "GET", "item-categories", 200)
-            
-            # Test get specific item if available
+            # Categories and the first item are independent lookups
+            specs = [("Get Item Categories", "GET", "item-categories", 200)]
             if len(items) > 0:
-                item_id = items[0]['id']
-                self.run_test("Get Specific Item", "GET", f"items/{item_id}", 200)
+                specs.append(("Get Specific Item", "GET", f"items/{items[0]['id']}", 200))
+            self.run_parallel(specs, parse_json=False)
                 
             return True
         return False
@@ -134,7 +64,7 @@ class DryCleanPOSAPITester:
         
         # Create a test customer
         customer_data = {
-            "name": f"Test Customer {datetime.now().strftime('%H%M%S')}",
+            "name": f"Test Customer {self.unique_suffix()}",
             "phone": "555-0123",
             "email": "test@example.com"
         }
@@ -145,13 +75,13 @@ class DryCleanPOSAPITester:
             print(f"   Created customer ID: {self.created_customer_id}")
             
             # Get all customers
-            self.run_test("Get All Customers", "GET", "customers", 200)
+            self.run_test("Get All Customers", "GET", "customers", 200, parse_json=False)
             
             # Get specific customer
-            self.run_test("Get Specific Customer", "GET", f"customers/{self.created_customer_id}", 200)
+            self.run_test("Get Specific Customer", "GET", f"customers/{self.created_customer_id}", 200, parse_json=False)
             
             # Search customers
-            self.run_test("Search Customers", "GET", f"customers?search=Test", 200)
+            self.run_test("Search Customers", "GET", f"customers?search=Test", 200, parse_json=False)
             
             return True
         return False
@@ -197,14 +127,14 @@ class DryCleanPOSAPITester:
             print(f"   Created order ID: {self.created_order_id}")
             
             # Get all orders
-            self.run_test("Get All Orders", "GET", "orders", 200)
+            self.run_test("Get All Orders", "GET", "orders", 200, parse_json=False)
             
             # Get specific order
-            self.run_test("Get Specific Order", "GET", f"orders/{self.created_order_id}", 200)
+            self.run_test("Get Specific Order", "GET", f"orders/{self.created_order_id}", 200, parse_json=False)
             
             # Update order status
             status_update = {"status": "processing"}
-            self.run_test("Update Order Status", "PUT", f"orders/{self.created_order_id}/status", 200, status_update)
+            self.run_test("Update Order Status", "PUT", f"orders/{self.created_order_id}/status", 200, status_update, parse_json=False)
             
             return True
         return False
@@ -231,11 +161,11 @@ class DryCleanPOSAPITester:
         """Test reports API"""
         print("\n🔍 Testing Reports API...")
         
-        # Test dashboard stats
-        self.run_test("Get Dashboard Stats", "GET", "reports/dashboard", 200)
-        
-        # Test sales report
-        self.run_test("Get Sales Report", "GET", "reports/sales", 200)
+        # Dashboard stats and the sales report are independent
+        self.run_parallel([
+            ("Get Dashboard Stats", "GET", "reports/dashboard", 200),
+            ("Get Sales Report", "GET", "reports/sales", 200),
+        ], parse_json=False)
         
         return True
 
@@ -253,24 +183,26 @@ class DryCleanPOSAPITester:
         print(f"📍 Base URL: {self.base_url}")
         print("=" * 60)
         
-        # Test sequence
-        tests = [
-            ("Health Check", self.test_health_check),
+        self.warmup()
+        
+        # Seeding creates the admin account, so it has to finish before logging in
+        self.run_group([
             ("Data Seeding", self.test_seed_data),
             ("Authentication", self.test_authentication),
-            ("Items API", self.test_items_api),
-            ("Customers API", self.test_customers_api),
-            ("Orders API", self.test_orders_api),
-            ("Payments API", self.test_payments_api),
-            ("Reports API", self.test_reports_api),
-            ("Users API", self.test_users_api),
-        ]
-        
-        for test_name, test_func in tests:
-            try:
-                test_func()
-            except Exception as e:
-                print(f"❌ {test_name} - Exception: {str(e)}")
+        ])
+        
+        # Everything else only needs the token; customer -> order -> payment stays one ordered chain
+        self.run_concurrently([
+            [("Health Check", self.test_health_check)],
+            [("Items API", self.test_items_api)],
+            [
+                ("Customers API", self.test_customers_api),
+                ("Orders API", self.test_orders_api),
+                ("Payments API", self.test_payments_api),
+            ],
+            [("Reports API", self.test_reports_api)],
+            [("Users API", self.test_users_api)],
+        ])
         
         # Print summary
         print("\n" + "=" * 60)
@@ -287,7 +219,10 @@ class DryCleanPOSAPITester:
 
 def main():
     tester = DryCleanPOSAPITester()
-    return tester.run_all_tests()
+    try:
+        return tester.run_all_tests()
+    finally:
+        tester.close()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -1,104 +1,37 @@
 #!/usr/bin/env python3
 
-import requests
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import json
 from datetime import datetime, timedelta
 import uuid
 
-class DryCleanNewFeaturesTester:
+from _api_tester import ApiTester
+
+class DryCleanNewFeaturesTester(ApiTester):
+    TIMEOUT = 15.0
+    LOGIN_TEST_NAME = "Login with admin credentials"
+    EMPTY_RESULT = {"status": "success"}
+    ERROR_TEXT_LIMIT = 200
+
     def __init__(self, base_url="https://fresh-garments-1.preview.emergentagent.com"):
-        self.base_url = base_url
-        self.token = None
-        self.tests_run = 0
-        self.tests_passed = 0
-        self.test_results = []
+        super().__init__(base_url)
         self.business_customer_id = None
+        self.business_customer = None
         self.order_id = None
         self.invoice_id = None
         self.item_id = None
         self.garment_id = None
 
-    def log_test(self, name, success, details=""):
-        """Log test result"""
-        self.tests_run += 1
-        if success:
-            self.tests_passed += 1
-            print(f"✅ {name}")
-        else:
-            print(f"❌ {name} - {details}")
-        
-        self.test_results.append({
-            "test": name,
-            "success": success,
-            "details": details
-        })
-
-    def run_test(self, name, method, endpoint, expected_status, data=None, headers=None, files=None):
-        """Run a single API test"""
-        url = f"{self.base_url}/api/{endpoint}"
-        test_headers = {}
-        
-        if self.token:
-            test_headers['Authorization'] = f'Bearer {self.token}'
-        
-        if headers:
-            test_headers.update(headers)
-        
-        # Only add Content-Type for JSON requests
-        if not files and data is not None:
-            test_headers['Content-Type'] = 'application/json'
-
-        try:
-            if method == 'GET':
-                response = requests.get(url, headers=test_headers, timeout=15)
-            elif method == 'POST':
-                if files:
-                    response = requests.post(url, files=files, data=data, headers=test_headers, timeout=15)
-                else:
-                    response = requests.post(url, json=data, headers=test_headers, timeout=15)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=test_headers, timeout=15)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=test_headers, timeout=15)
-
-            success = response.status_code == expected_status
-            details = f"Status: {response.status_code}"
-            
-            if not success:
-                details += f" (Expected {expected_status})"
-                try:
-                    error_data = response.json()
-                    details += f" - {error_data.get('detail', 'Unknown error')}"
-                except:
-                    details += f" - {response.text[:200]}"
-
-            self.log_test(name, success, details)
-            
-            if success:
-                try:
-                    return response.json()
-                except:
-                    return {"status": "success"}
-            return None
-
-        except Exception as e:
-            self.log_test(name, False, f"Exception: {str(e)}")
-            return None
-
     def test_authentication(self):
         """Test authentication with provided credentials"""
         print("\n🔍 Testing Authentication...")
         
-        login_data = {
-            "email": "admin@dryclean.com",
-            "password": "admin123"
-        }
-        
-        result = self.run_test("Login with admin credentials", "POST", "auth/login", 200, login_data)
-        if result and 'access_token' in result:
-            self.token = result['access_token']
+        if self.login():
             print(f"   Token obtained: {self.token[:20]}...")
+            
+            # Checks the token just issued against the server
+            self.run_test("Get Current User", "GET", "auth/me", 200, parse_json=False)
             return True
         
         return False
@@ -107,7 +40,7 @@ class DryCleanNewFeaturesTester:
         """Test Company Profile Settings endpoints"""
         print("\n🔍 Testing Company Profile Settings...")
         
-        # Test GET company profile
+        # Test GET company profile, a snapshot from before the update
         profile_result = self.run_test("GET Company Profile", "GET", "settings/company-profile", 200)
         
         # Test PUT company profile with sample data
@@ -137,9 +70,12 @@ class DryCleanNewFeaturesTester:
         
         update_result = self.run_test("PUT Company Profile", "PUT", "settings/company-profile", 200, profile_data)
         
-        # Verify the update worked
+        # Verify the update worked, from the PUT response when it carries the saved profile
         if update_result:
-            verify_result = self.run_test("Verify Company Profile Update", "GET", "settings/company-profile", 200)
+            if 'company_profile' in update_result:
+                verify_result = update_result
+            else:
+                verify_result = self.run_test("Verify Company Profile Update", "GET", "settings/company-profile", 200)
             if verify_result:
                 company_profile = verify_result.get("company_profile", {})
                 if (company_profile.get("logo_on_receipts") == True and 
@@ -155,7 +91,7 @@ class DryCleanNewFeaturesTester:
         print("\n🔍 Testing Notification Settings...")
         
         # Test GET notification settings
-        settings_result = self.run_test("GET Notification Settings", "GET", "settings/notifications", 200)
+        settings_result = self.run_test("GET Notification Settings", "GET", "settings/notifications", 200, parse_json=False)
         
         # Test PUT notification settings
         notification_data = {
@@ -178,7 +114,7 @@ class DryCleanNewFeaturesTester:
             ]
         }
         
-        update_result = self.run_test("PUT Notification Settings", "PUT", "settings/notifications", 200, notification_data)
+        update_result = self.run_test("PUT Notification Settings", "PUT", "settings/notifications", 200, notification_data, parse_json=False)
         
         return settings_result is not None and update_result is not None
 
@@ -196,7 +132,7 @@ class DryCleanNewFeaturesTester:
         
         # Test POST item with pieces field
         item_data = {
-            "name": f"Test Suit {datetime.now().strftime('%H%M%S')}",
+            "name": f"Test Suit {self.unique_suffix()}",
             "category_id": category_id,
             "prices": {
                 "regular": 25.00,
@@ -232,13 +168,10 @@ class DryCleanNewFeaturesTester:
         
         return False
 
-    def test_invoice_system(self):
-        """Test Invoice System endpoints"""
-        print("\n🔍 Testing Invoice System...")
-        
-        # First create a business customer
+    def create_business_customer(self):
+        """Create the business customer the invoice tests bill"""
         business_customer_data = {
-            "name": f"Business Customer {datetime.now().strftime('%H%M%S')}",
+            "name": f"Business Customer {self.unique_suffix()}",
             "phone": "555-0199",
             "email": "business@example.com",
             "customer_type": "business",
@@ -251,13 +184,31 @@ class DryCleanNewFeaturesTester:
         }
         
         customer_result = self.run_test("Create Business Customer", "POST", "customers", 200, business_customer_data)
-        if not customer_result or 'id' not in customer_result:
+        if customer_result and 'id' in customer_result:
+            self.business_customer = customer_result
+            self.business_customer_id = customer_result['id']
+            print(f"   Created business customer ID: {self.business_customer_id}")
+            return True
+        return False
+
+    def bootstrap_fixtures(self):
+        """Create the item and the business customer the invoice chain needs at the same time"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(lambda create: create(), [
+                self.test_items_with_pieces,
+                self.create_business_customer,
+            ]))
+        return all(results)
+
+    def test_invoice_system(self):
+        """Test Invoice System endpoints"""
+        print("\n🔍 Testing Invoice System...")
+        
+        # Reuse the bootstrapped business customer when there is one
+        if not self.business_customer_id and not self.create_business_customer():
             print("   Failed to create business customer, skipping invoice tests")
             return False
         
-        self.business_customer_id = customer_result['id']
-        print(f"   Created business customer ID: {self.business_customer_id}")
-        
         # Create an order with invoice payment method
         if not self.item_id:
             print("   No item available, skipping order creation")
@@ -265,8 +216,8 @@ class DryCleanNewFeaturesTester:
         
         order_data = {
             "customer_id": self.business_customer_id,
-            "customer_name": business_customer_data["name"],
-            "customer_phone": business_customer_data["phone"],
+            "customer_name": self.business_customer["name"],
+            "customer_phone": self.business_customer["phone"],
             "customer_type": "business",
             "items": [{
                 "item_id": self.item_id,
@@ -305,11 +256,11 @@ class DryCleanNewFeaturesTester:
                 self.invoice_id = invoice_result['id']
                 print(f"   Created invoice ID: {self.invoice_id}")
         
-        # Test GET invoices list
-        invoices_result = self.run_test("GET Invoices List", "GET", "invoices", 200)
-        
-        # Test GET invoice summary
-        summary_result = self.run_test("GET Invoice Summary", "GET", "invoices/summary", 200)
+        # Invoice list and summary are independent reads
+        invoices_result, summary_result = self.run_parallel([
+            ("GET Invoices List", "GET", "invoices", 200),
+            ("GET Invoice Summary", "GET", "invoices/summary", 200),
+        ], parse_json=False)
         
         # Test POST invoice payment
         if self.invoice_id:
@@ -319,7 +270,7 @@ class DryCleanNewFeaturesTester:
                 "notes": "Test payment"
             }
             
-            payment_result = self.run_test("POST Invoice Payment", "POST", f"invoices/{self.invoice_id}/payment", 200, payment_data)
+            payment_result = self.run_test("POST Invoice Payment", "POST", f"invoices/{self.invoice_id}/payment", 200, payment_data, parse_json=False)
         
         return True
 
@@ -331,17 +282,17 @@ class DryCleanNewFeaturesTester:
             print("   No order available, skipping garment tags tests")
             return False
         
-        # Test GET garment tags for order
-        tags_result = self.run_test("GET Order Garment Tags", "GET", f"orders/{self.order_id}/garment-tags", 200)
+        # Tags and printable labels for the order are independent
+        tags_result, labels_result = self.run_parallel([
+            ("GET Order Garment Tags", "GET", f"orders/{self.order_id}/garment-tags", 200),
+            ("GET Order Labels", "GET", f"orders/{self.order_id}/labels", 200),
+        ])
         if tags_result and len(tags_result) > 0:
             self.garment_id = tags_result[0].get('garment_id')
             print(f"   Found {len(tags_result)} garment tags")
             if self.garment_id:
                 print(f"   First garment ID: {self.garment_id}")
         
-        # Test GET printable labels
-        labels_result = self.run_test("GET Order Labels", "GET", f"orders/{self.order_id}/labels", 200)
-        
         # Test GET garment lookup by ID
         if self.garment_id:
             garment_result = self.run_test("GET Garment by ID", "GET", f"garment/{self.garment_id}", 200)
@@ -356,24 +307,27 @@ class DryCleanNewFeaturesTester:
         print(f"📍 Base URL: {self.base_url}")
         print("=" * 70)
         
-        # Test sequence
-        tests = [
-            ("Authentication", self.test_authentication),
-            ("Company Profile Settings", self.test_company_profile_settings),
-            ("Notification Settings", self.test_notification_settings),
-            ("Items with Pieces Field", self.test_items_with_pieces),
-            ("Invoice System", self.test_invoice_system),
-            ("Garment Tags / QR Codes", self.test_garment_tags_qr_codes),
-        ]
-        
-        for test_name, test_func in tests:
-            try:
-                success = test_func()
-                if not success and test_name == "Authentication":
-                    print("❌ Authentication failed - stopping tests")
-                    break
-            except Exception as e:
-                print(f"❌ {test_name} - Exception: {str(e)}")
+        self.warmup()
+        
+        try:
+            authenticated = self.test_authentication()
+        except Exception as e:
+            print(f"❌ Authentication - Exception: {str(e)}")
+            authenticated = False
+        
+        if not authenticated:
+            print("❌ Authentication failed - stopping tests")
+        else:
+            # Settings sections are updated independently; fixtures -> invoice -> garment tags stays one ordered chain
+            self.run_concurrently([
+                [("Company Profile Settings", self.test_company_profile_settings)],
+                [("Notification Settings", self.test_notification_settings)],
+                [
+                    ("Item and Business Customer Fixtures", self.bootstrap_fixtures),
+                    ("Invoice System", self.test_invoice_system),
+                    ("Garment Tags / QR Codes", self.test_garment_tags_qr_codes),
+                ],
+            ])
         
         # Print summary
         print("\n" + "=" * 70)
@@ -382,11 +336,11 @@ class DryCleanNewFeaturesTester:
         print(f"📈 Success Rate: {success_rate:.1f}%")
         
         # Print failed tests
-        failed_tests = [t for t in self.test_results if not t['success']]
+        failed_tests = [(name, details) for name, success, details in self.test_results if not success]
         if failed_tests:
             print(f"\n❌ Failed Tests ({len(failed_tests)}):")
-            for test in failed_tests:
-                print(f"   • {test['test']}: {test['details']}")
+            for name, details in failed_tests:
+                print(f"   • {name}: {details}")
         
         if self.tests_passed < self.tests_run:
             print("\n❌ Some tests failed. Check the details above.")
@@ -397,7 +351,10 @@ class DryCleanNewFeaturesTester:
 
 def main():
     tester = DryCleanNewFeaturesTester()
-    return tester.run_all_tests()
+    try:
+        return tester.run_all_tests()
+    finally:
+        tester.close()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -1,10 +1,46 @@
 #!/usr/bin/env python3
 
-import requests
+import asyncio
+import httpx
+import random
+import re
 import sys
+import time
 import json
+import orjson
 from datetime import datetime
 
+# Transient failures (connection errors, timeouts, 5xx, 429) are retried with
+# exponential backoff and full jitter; other 4xx responses are returned at once
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 8.0
+
+# Repeating these leaves the server as one call would. Anything else (POST) is
+# retried only when the connection never opened: a timed-out or 5xx POST may
+# already be committed, and sending it again would create a duplicate.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+# After this many consecutive transient failures a route fails fast until the
+# cooldown passes, then a single probe decides whether it closes again. Equal to
+# RETRY_ATTEMPTS, so one call that exhausts its retries opens the breaker.
+CIRCUIT_FAILURE_THRESHOLD = RETRY_ATTEMPTS
+CIRCUIT_COOLDOWN = 30.0
+
+# Id segments (uuids) are folded out of the path, so customers/<id> calls share one breaker
+ROUTE_ID_SEGMENT = re.compile(r"(?<=/)[0-9a-fA-F-]{8,}(?=/|$)")
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a path whose circuit breaker is open"""
+
+def parse_json(response):
+    """Decode a response body once; None when it isn't JSON"""
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return None
+
 class DryCleanBugFixTester:
     def __init__(self, base_url="https://fresh-garments-1.preview.emergentagent.com"):
         self.base_url = base_url
@@ -12,6 +48,16 @@ class DryCleanBugFixTester:
         self.tests_run = 0
         self.tests_passed = 0
         self.test_results = []
+        # One async client for every call: the tests run concurrently on one event loop
+        # and share its keep-alive connection and timeout
+        self.client = httpx.AsyncClient(
+            base_url=f"{self.base_url}/api/",
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=8),
+        )
+        # Circuit breaker per route template: {"state", "failures", "opened_at"}
+        self._breakers = {}
 
     def log_test(self, name, success, details=""):
         """Log test result"""
@@ -28,7 +74,50 @@ class DryCleanBugFixTester:
             "details": details
         })
 
-    def authenticate(self):
+    def _check_breaker(self, key):
+        """Raise CircuitOpen unless the route may be called; after the cooldown one caller probes it"""
+        breaker = self._breakers.get(key)
+        if breaker is None or breaker["state"] == "CLOSED":
+            return
+        if breaker["state"] == "OPEN" and time.monotonic() - breaker["opened_at"] >= CIRCUIT_COOLDOWN:
+            breaker["state"] = "HALF_OPEN"
+            return
+        raise CircuitOpen(key)
+
+    def _record_outcome(self, key, ok):
+        """Close the breaker on success; open it on a failed probe or too many failures in a row"""
+        breaker = self._breakers.get(key)
+        if ok:
+            if breaker is not None:
+                breaker.update(state="CLOSED", failures=0)
+            return
+        if breaker is None:
+            breaker = self._breakers[key] = {"state": "CLOSED", "failures": 0, "opened_at": 0.0}
+        breaker["failures"] += 1
+        if breaker["state"] == "HALF_OPEN" or breaker["failures"] >= CIRCUIT_FAILURE_THRESHOLD:
+            breaker.update(state="OPEN", opened_at=time.monotonic())
+
+    async def _request(self, method, path, **kwargs):
+        """Send a request, retrying transient failures so a flaky host doesn't fail the test"""
+        key = ROUTE_ID_SEGMENT.sub("{id}", path.split("?", 1)[0])
+        idempotent = method in IDEMPOTENT_METHODS
+        for attempt in range(RETRY_ATTEMPTS):
+            last_attempt = attempt == RETRY_ATTEMPTS - 1
+            self._check_breaker(key)
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                self._record_outcome(key, False)
+                if last_attempt or not (idempotent or isinstance(e, UNSENT_ERRORS)):
+                    raise
+            else:
+                transient = response.status_code >= 500 or response.status_code == 429
+                self._record_outcome(key, not transient)
+                if not transient or not idempotent or last_attempt:
+                    return response
+            await asyncio.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+
+    async def authenticate(self):
         """Authenticate with admin credentials"""
         print("\n🔐 Authenticating...")
         
@@ -37,13 +126,14 @@ class DryCleanBugFixTester:
             "password": "admin123"
         }
         
-        url = f"{self.base_url}/api/auth/login"
         try:
-            response = requests.post(url, json=login_data, timeout=10)
+            response = await self._request("POST", "auth/login", json=login_data)
             if response.status_code == 200:
-                result = response.json()
-                if 'access_token' in result:
+                result = parse_json(response)
+                if result and 'access_token' in result:
                     self.token = result['access_token']
+                    # Every later call sends the token from the client defaults
+                    self.client.headers['Authorization'] = f'Bearer {self.token}'
                     print(f"   ✅ Authentication successful")
                     return True
             
@@ -54,18 +144,16 @@ class DryCleanBugFixTester:
             print(f"   ❌ Authentication error: {str(e)}")
             return False
 
-    def test_orders_endpoint(self):
+    async def test_orders_endpoint(self):
         """Test GET /api/orders endpoint - Bug Fix #1"""
         print("\n🔍 Testing Orders Endpoint Bug Fix...")
         
-        url = f"{self.base_url}/api/orders"
-        headers = {'Authorization': f'Bearer {self.token}'}
-        
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = await self._request("GET", "orders")
+            payload = parse_json(response)
             
             if response.status_code == 200:
-                orders = response.json()
+                orders = payload
                 self.log_test("Orders endpoint returns 200", True, f"Found {len(orders)} orders")
                 
                 # Check if orders have proper structure
@@ -88,18 +176,19 @@ class DryCleanBugFixTester:
                     
             else:
                 error_msg = f"Status: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    error_msg += f" - {error_data.get('detail', 'Unknown error')}"
-                except:
+                if isinstance(payload, dict):
+                    error_msg += f" - {payload.get('detail', 'Unknown error')}"
+                else:
                     error_msg += f" - {response.text[:100]}"
                 
                 self.log_test("Orders endpoint returns 200", False, error_msg)
                 
+        except CircuitOpen:
+            self.log_test("Orders endpoint", False, "circuit open")
         except Exception as e:
             self.log_test("Orders endpoint", False, f"Exception: {str(e)}")
 
-    def test_customer_loyalty_excluded(self):
+    async def test_customer_loyalty_excluded(self):
         """Test creating customer with loyalty_excluded field - Bug Fix #2"""
         print("\n🔍 Testing Customer loyalty_excluded Field Bug Fix...")
         
@@ -111,17 +200,12 @@ class DryCleanBugFixTester:
             "loyalty_excluded": True
         }
         
-        url = f"{self.base_url}/api/customers"
-        headers = {
-            'Authorization': f'Bearer {self.token}',
-            'Content-Type': 'application/json'
-        }
-        
         try:
-            response = requests.post(url, json=customer_data, headers=headers, timeout=10)
+            response = await self._request("POST", "customers", json=customer_data)
+            payload = parse_json(response)
             
             if response.status_code == 200:
-                customer = response.json()
+                customer = payload
                 self.log_test("Create customer with loyalty_excluded", True, f"Customer ID: {customer.get('id')}")
                 
                 # Check if loyalty_excluded field is preserved
@@ -134,11 +218,10 @@ class DryCleanBugFixTester:
                 # Test retrieving the customer to ensure field persists
                 customer_id = customer.get('id')
                 if customer_id:
-                    get_url = f"{self.base_url}/api/customers/{customer_id}"
-                    get_response = requests.get(get_url, headers=headers, timeout=10)
+                    get_response = await self._request("GET", f"customers/{customer_id}")
                     
                     if get_response.status_code == 200:
-                        retrieved_customer = get_response.json()
+                        retrieved_customer = parse_json(get_response)
                         if retrieved_customer.get('loyalty_excluded') == True:
                             self.log_test("loyalty_excluded persists in database", True)
                         else:
@@ -150,29 +233,28 @@ class DryCleanBugFixTester:
                         
             else:
                 error_msg = f"Status: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    error_msg += f" - {error_data.get('detail', 'Unknown error')}"
-                except:
+                if isinstance(payload, dict):
+                    error_msg += f" - {payload.get('detail', 'Unknown error')}"
+                else:
                     error_msg += f" - {response.text[:100]}"
                 
                 self.log_test("Create customer with loyalty_excluded", False, error_msg)
                 
+        except CircuitOpen:
+            self.log_test("Customer loyalty_excluded test", False, "circuit open")
         except Exception as e:
             self.log_test("Customer loyalty_excluded test", False, f"Exception: {str(e)}")
 
-    def test_settings_currency(self):
+    async def test_settings_currency(self):
         """Test GET /api/settings for country/currency settings - Bug Fix #3"""
         print("\n🔍 Testing Settings Currency Bug Fix...")
         
-        url = f"{self.base_url}/api/settings"
-        headers = {'Authorization': f'Bearer {self.token}'}
-        
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = await self._request("GET", "settings")
+            payload = parse_json(response)
             
             if response.status_code == 200:
-                settings = response.json()
+                settings = payload
                 self.log_test("Settings endpoint returns 200", True)
                 
                 # Check if settings have proper structure
@@ -202,47 +284,51 @@ class DryCleanBugFixTester:
                     
             else:
                 error_msg = f"Status: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    error_msg += f" - {error_data.get('detail', 'Unknown error')}"
-                except:
+                if isinstance(payload, dict):
+                    error_msg += f" - {payload.get('detail', 'Unknown error')}"
+                else:
                     error_msg += f" - {response.text[:100]}"
                 
                 self.log_test("Settings endpoint returns 200", False, error_msg)
                 
+        except CircuitOpen:
+            self.log_test("Settings currency test", False, "circuit open")
         except Exception as e:
             self.log_test("Settings currency test", False, f"Exception: {str(e)}")
 
-    def test_items_has_children(self):
+    async def test_items_has_children(self):
         """Test GET /api/items for has_children field - Bug Fix #4"""
         print("\n🔍 Testing Items has_children Field Bug Fix...")
         
-        url = f"{self.base_url}/api/items"
-        headers = {'Authorization': f'Bearer {self.token}'}
-        
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = await self._request("GET", "items")
+            payload = parse_json(response)
             
             if response.status_code == 200:
-                items = response.json()
+                items = payload
                 self.log_test("Items endpoint returns 200", True, f"Found {len(items)} items")
                 
                 if isinstance(items, list) and len(items) > 0:
                     self.log_test("Items endpoint returns list", True)
                     
-                    # Check if all items have has_children field
-                    items_with_has_children = [item for item in items if 'has_children' in item]
+                    # Tally missing, non-boolean and true has_children values in one pass
+                    missing_count = non_boolean_count = with_children = 0
+                    for item in items:
+                        if 'has_children' not in item:
+                            missing_count += 1
+                        elif not isinstance(item['has_children'], bool):
+                            non_boolean_count += 1
+                        elif item['has_children']:
+                            with_children += 1
                     
-                    if len(items_with_has_children) == len(items):
+                    if not missing_count:
                         self.log_test("All items have has_children field", True)
                         
                         # Check if has_children is boolean
-                        boolean_check = all(isinstance(item.get('has_children'), bool) for item in items)
-                        if boolean_check:
+                        if not non_boolean_count:
                             self.log_test("has_children field is boolean", True)
                             
                             # Count items with/without children
-                            with_children = len([item for item in items if item.get('has_children')])
                             without_children = len(items) - with_children
                             self.log_test("has_children field values", True, 
                                         f"{with_children} with children, {without_children} without")
@@ -250,7 +336,6 @@ class DryCleanBugFixTester:
                             self.log_test("has_children field is boolean", False, 
                                         "Some has_children values are not boolean")
                     else:
-                        missing_count = len(items) - len(items_with_has_children)
                         self.log_test("All items have has_children field", False, 
                                     f"{missing_count} items missing has_children field")
                         
@@ -261,25 +346,26 @@ class DryCleanBugFixTester:
                     
             else:
                 error_msg = f"Status: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    error_msg += f" - {error_data.get('detail', 'Unknown error')}"
-                except:
+                if isinstance(payload, dict):
+                    error_msg += f" - {payload.get('detail', 'Unknown error')}"
+                else:
                     error_msg += f" - {response.text[:100]}"
                 
                 self.log_test("Items endpoint returns 200", False, error_msg)
                 
+        except CircuitOpen:
+            self.log_test("Items has_children test", False, "circuit open")
         except Exception as e:
             self.log_test("Items has_children test", False, f"Exception: {str(e)}")
 
-    def run_bug_fix_tests(self):
+    async def run_bug_fix_tests(self):
         """Run all bug fix tests"""
         print("🐛 Starting DryClean POS Bug Fix Tests")
         print(f"📍 Base URL: {self.base_url}")
         print("=" * 60)
         
         # Authenticate first
-        if not self.authenticate():
+        if not await self.authenticate():
             print("❌ Authentication failed. Cannot proceed with tests.")
             return 1
         
@@ -291,11 +377,11 @@ class DryCleanBugFixTester:
             ("Items has_children Field Bug Fix", self.test_items_has_children),
         ]
         
-        for test_name, test_func in bug_fix_tests:
-            try:
-                test_func()
-            except Exception as e:
-                print(f"❌ {test_name} - Exception: {str(e)}")
+        # The tests are independent and network-bound, so run them at once
+        results = await asyncio.gather(*(test_func() for _, test_func in bug_fix_tests), return_exceptions=True)
+        for (test_name, _), result in zip(bug_fix_tests, results):
+            if isinstance(result, Exception):
+                print(f"❌ {test_name} - Exception: {str(result)}")
         
         # Print summary
         print("\n" + "=" * 60)
@@ -310,9 +396,15 @@ class DryCleanBugFixTester:
             print("\n✅ All bug fix tests passed!")
             return 0
 
-def main():
+async def run():
     tester = DryCleanBugFixTester()
-    return tester.run_bug_fix_tests()
+    try:
+        return await tester.run_bug_fix_tests()
+    finally:
+        await tester.client.aclose()
+
+def main():
+    return asyncio.run(run())
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
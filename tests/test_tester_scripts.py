@@ -0,0 +1,40 @@
+"""
+Smoke tests for the root API tester scripts
+
+Nothing is sent: each tester is built against an unused local port, and every
+self.<name> its methods read must resolve on it, so a helper lost while moving
+code between a script and _api_tester fails here instead of mid-run.
+"""
+
+import ast
+import importlib
+import inspect
+
+import pytest
+
+TESTERS = [
+    ("backend_test", "DryCleanPOSAPITester"),
+    ("backend_test_new_features", "DryCleanNewFeaturesTester"),
+]
+
+
+def self_attributes(cls):
+    """Names read as self.<name> in the class body, minus those it assigns itself"""
+    tree = ast.parse(inspect.getsource(cls))
+    read, assigned = set(), set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self":
+            (assigned if isinstance(node.ctx, ast.Store) else read).add(node.attr)
+    return read - assigned
+
+
+@pytest.mark.parametrize("module_name,class_name", TESTERS)
+def test_tester_starts(module_name, class_name):
+    module = importlib.import_module(module_name)
+    tester = getattr(module, class_name)(base_url="http://127.0.0.1:9")
+    try:
+        missing = sorted(name for name in self_attributes(type(tester)) if not hasattr(tester, name))
+        assert not missing, f"{class_name} is missing {missing}"
+        assert callable(tester.run_all_tests)
+    finally:
+        tester.close()